@@ -1,12 +1,11 @@
 import sys
 from PySide6.QtWidgets import QApplication
 from ui.main_window import MainWindow
-from ui.styles import LIGHT_STYLE
 
 def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
-    app.setStyleSheet(LIGHT_STYLE)
+    # the app-wide style sheet is set once by MainWindow (theme)
 
     w = MainWindow()
     w.show()
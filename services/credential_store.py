@@ -1,39 +1,67 @@
 import keyring
 import json
+import threading
 
 SERVICE_NAME = "S3BrowserApp"
 
+# one keyring entry per field (no JSON parse on load)
+FIELDS = ("access_key", "secret_key", "region")
+
+# old single-entry JSON blob, still read so saved logins keep working
+LEGACY_USERNAME = "aws_credentials"
+
+# decoded credentials, kept in memory after the first keyring read
+_cache = None
+_lock = threading.Lock()
+
+
+def _delete(username):
+    try:
+        keyring.delete_password(SERVICE_NAME, username)
+    except keyring.errors.PasswordDeleteError:
+        pass
+
 
 class CredentialStore:
     @staticmethod
     def save(access_key, secret_key, region):
+        global _cache
         data = {
             "access_key": access_key,
             "secret_key": secret_key,
             "region": region,
         }
-        keyring.set_password(
-            SERVICE_NAME,
-            "aws_credentials",
-            json.dumps(data)
-        )
+        with _lock:
+            for name in FIELDS:
+                keyring.set_password(SERVICE_NAME, name, data[name])
+            _delete(LEGACY_USERNAME)
+            _cache = None
 
     @staticmethod
     def load():
-        data = keyring.get_password(
-            SERVICE_NAME,
-            "aws_credentials"
-        )
-        if not data:
-            return None
-        return json.loads(data)
+        global _cache
+        with _lock:
+            if _cache is not None:
+                return _cache
+
+            data = {name: keyring.get_password(SERVICE_NAME, name) for name in FIELDS}
+            if not all(data.values()):
+                legacy = keyring.get_password(
+                    SERVICE_NAME,
+                    LEGACY_USERNAME
+                )
+                if not legacy:
+                    return None
+                data = json.loads(legacy)
+
+            _cache = data
+            return _cache
 
     @staticmethod
     def clear():
-        try:
-            keyring.delete_password(
-                SERVICE_NAME,
-                "aws_credentials"
-            )
-        except keyring.errors.PasswordDeleteError:
-            pass
\ No newline at end of file
+        global _cache
+        with _lock:
+            _cache = None
+            for name in FIELDS:
+                _delete(name)
+            _delete(LEGACY_USERNAME)
@@ -1,3 +1,8 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
 import boto3
 from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
@@ -5,16 +10,42 @@ from botocore.config import Config
 from services.credential_store import CredentialStore
 
 
+class S3DeleteError(RuntimeError):
+    """DeleteObjects left keys behind; errors: S3's per-key entries (Key, Code, Message)."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        e = errors[0]
+        super().__init__(f"{len(errors)} object(s) not deleted "
+                         f"(first: {e.get('Key')}: {e.get('Code')} {e.get('Message', '')})")
+
+
 class S3Client:
-    def __init__(self):
-        creds = CredentialStore.load()
+    # transfer tuning (socket read size; upper bound on threads per file)
+    IO_CHUNKSIZE = 2 * 1024 * 1024
+    MAX_FILE_CONCURRENCY = 32
+    # jobs one fan-out op keeps queued/running on the shared pool
+    # (byte ranges of a ranged download, DeleteObjects pages, rename copies)
+    RANGED_INFLIGHT = 8
+    DELETE_INFLIGHT = 8
+    COPY_INFLIGHT = 16      # server-side copies: no local I/O, just round trips
+    # folders deleted side by side (each a list -> delete -> marker chain)
+    PREFIX_WALKERS = 4
+    # HTTP connections of the boto3 client, shared by every transfer running at once
+    MAX_POOL_CONNECTIONS = 50
+    # per-key DeleteObjects errors worth another try (a throttled request
+    # as a whole is already retried by botocore)
+    DELETE_RETRY_CODES = ("SlowDown", "InternalError", "ServiceUnavailable")
+
+    def __init__(self, creds=None):
+        creds = creds or CredentialStore.load()
         if not creds:
             raise RuntimeError("AWS credentials not configured")
 
         boto_config = Config(
             region_name=creds["region"],
             retries={"max_attempts": 10, "mode": "adaptive"},
-            max_pool_connections=50,
+            max_pool_connections=self.MAX_POOL_CONNECTIONS,
             connect_timeout=10,
             read_timeout=60,
             tcp_keepalive=True,
@@ -28,64 +59,202 @@ class S3Client:
         self.s3 = session.client("s3", config=boto_config)
 
         self.transfer_config = TransferConfig(
-            multipart_threshold=32 * 1024 * 1024,
-            multipart_chunksize=32 * 1024 * 1024,
-            max_concurrency=20,
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=16,
+            io_chunksize=self.IO_CHUNKSIZE,
             use_threads=True,
             num_download_attempts=10,
         )
 
+        self._list_paginator = self.s3.get_paginator("list_objects_v2")
+
+        # one executor for all fan-out ops (delete, rename, ranged GET),
+        # sized under max_pool_connections so HTTP connections are never short
+        self._pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="s3io")
+        # folder walkers wait on _pool jobs, so they get their own few threads:
+        # parked on _pool they could take every thread their jobs need
+        self._walk_pool = ThreadPoolExecutor(max_workers=self.PREFIX_WALKERS,
+                                             thread_name_prefix="s3walk")
+
+    def close(self):
+        """Stop the shared executors (pending fan-out work is dropped)."""
+        self._walk_pool.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _wait_all(futures):
+        """Wait for futures; on the first failure cancel the rest and re-raise."""
+        try:
+            for fut in as_completed(futures):
+                fut.result()
+        except Exception:
+            for fut in futures:
+                fut.cancel()
+            raise
+
+    def _run_bounded(self, fn, jobs, inflight, stop=None, pool=None):
+        """
+        fn(*args) for each args tuple in jobs, on the shared pool (or pool), with at most
+        inflight of them queued/running: a long (or lazily listed) job list
+        must not flood the FIFO pool other fan-out ops wait on.
+        stop(): checked before each submit; True ends submission early.
+        On the first failure the rest is cancelled and the error re-raised.
+        Every started job has finished when this returns (or raises).
+        Returns the results in job order.
+        """
+        slots = threading.BoundedSemaphore(inflight)
+        errors = []
+
+        def on_done(fut):
+            if not fut.cancelled() and fut.exception() is not None:
+                errors.append(fut.exception())
+            slots.release()
+
+        futures = []
+        try:
+            for args in jobs:
+                slots.acquire()
+                if errors or (stop and stop()):
+                    break
+                fut = (pool or self._pool).submit(fn, *args)
+                fut.add_done_callback(on_done)
+                futures.append(fut)
+            self._wait_all(futures)
+        finally:
+            for fut in futures:
+                fut.cancel()
+            wait(futures)
+        return [fut.result() for fut in futures]
+
     # ---------------- listing ----------------
     def list_buckets(self):
         r = self.s3.list_buckets()
         return [b["Name"] for b in r.get("Buckets", [])]
 
-    def list_objects(self, bucket_name, prefix=""):
-        r = self.s3.list_objects_v2(
+    def iter_object_pages(self, bucket_name, prefix=""):
+        """
+        One level under prefix (ListObjectsV2 + Delimiter), one page (<=1000 entries)
+        at a time. StartAfter=prefix makes S3 skip the folder marker server-side.
+        Yields (folders, files, truncated) so callers can show the first page early
+        (truncated: more pages follow).
+        """
+        kwargs = dict(Bucket=bucket_name, Prefix=prefix, Delimiter="/",
+                      PaginationConfig={"PageSize": 1000})
+        if prefix.endswith("/"):
+            kwargs["StartAfter"] = prefix
+        for page in self._list_paginator.paginate(**kwargs):
+            folders = [p["Prefix"] for p in page.get("CommonPrefixes", [])]
+            files = page.get("Contents", [])
+            yield folders, files, bool(page.get("IsTruncated"))
+
+    def iter_all_keys(self, bucket_name, prefix=""):
+        """Pagination: yield EVERY key under a prefix (no delimiter), page by page."""
+        pages = self._list_paginator.paginate(
             Bucket=bucket_name,
             Prefix=prefix,
-            Delimiter="/",
+            PaginationConfig={"PageSize": 1000},
         )
-        folders = [p["Prefix"] for p in r.get("CommonPrefixes", [])]
-        files = [o for o in r.get("Contents", []) if o["Key"] != prefix]
-        return folders, files
-
-    def list_all_keys(self, bucket_name, prefix=""):
-        """Pagination: list EVERYTHING under a prefix (no delimiter)."""
-        keys = []
-        token = None
-        while True:
-            kwargs = dict(Bucket=bucket_name, Prefix=prefix)
-            if token:
-                kwargs["ContinuationToken"] = token
-            r = self.s3.list_objects_v2(**kwargs)
-            for o in r.get("Contents", []):
-                keys.append(o["Key"])
-            if r.get("IsTruncated"):
-                token = r.get("NextContinuationToken")
-            else:
-                break
-        return keys
+        for page in pages:
+            for o in page.get("Contents", ()):
+                yield o["Key"]
 
     # ---------------- transfers ----------------
-    def upload_file(self, local_path, bucket, key, progress_cb=None):
+    def connection_share(self, workers: int) -> int:
+        """Connections one of `workers` concurrent transfers may use."""
+        return max(1, self.MAX_POOL_CONNECTIONS // max(1, workers))
+
+    def transfer_config_for(self, size: int, workers: int = 1) -> TransferConfig:
+        """
+        TransferConfig shaped to the file:
+        - small files stay single-part with a few threads
+        - big files get bigger parts and more concurrency
+        - workers: transfers running side by side; their threads together
+          stay within max_pool_connections
+        """
+        mb = 1024 * 1024
+        share = self.connection_share(workers)
+        if not size:
+            if self.transfer_config.max_concurrency <= share:
+                return self.transfer_config
+            chunk, threads = self.transfer_config.multipart_chunksize, self.transfer_config.max_concurrency
+        else:
+            chunk = min(128 * mb, max(8 * mb, size // 64))
+            threads = min(self.MAX_FILE_CONCURRENCY, max(8, size // (32 * mb)))
+        return TransferConfig(
+            multipart_threshold=8 * mb,
+            multipart_chunksize=chunk,
+            max_concurrency=min(threads, share),
+            io_chunksize=self.IO_CHUNKSIZE,
+            use_threads=True,
+            num_download_attempts=10,
+        )
+
+    def upload_file(self, local_path, bucket, key, progress_cb=None, size=0, workers=1):
         self.s3.upload_file(
             Filename=local_path,
             Bucket=bucket,
             Key=key,
             Callback=progress_cb,
-            Config=self.transfer_config,
+            Config=self.transfer_config_for(size, workers),
         )
 
-    def download_file(self, bucket, key, local_path, progress_cb=None):
+    def download_file(self, bucket, key, local_path, progress_cb=None, size=0, workers=1):
         self.s3.download_file(
             Bucket=bucket,
             Key=key,
             Filename=local_path,
             Callback=progress_cb,
-            Config=self.transfer_config,
+            Config=self.transfer_config_for(size, workers),
         )
 
+    def download_file_ranged(self, bucket, key, local_path, chunksize=64 * 1024 * 1024,
+                             progress_cb=None, size=0, workers=1):
+        """
+        Parallel byte-range GETs (on the shared pool) written straight into
+        a preallocated file. Used for OPEN, where time-to-last-byte matters most.
+        Returns the bytes written (the preallocated file size says nothing).
+        """
+        total = size or self.get_object_size(bucket, key)
+        ranges = [(a, min(a + chunksize, total) - 1) for a in range(0, total, chunksize)]
+
+        with open(local_path, "wb") as f:
+            f.truncate(total)
+        if not ranges:
+            return 0
+
+        fd = os.open(local_path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+        lock = threading.Lock()
+
+        def write_at(pos, data):
+            if hasattr(os, "pwrite"):
+                os.pwrite(fd, data, pos)
+            else:
+                # Windows: no pwrite, so seek+write under a lock
+                with lock:
+                    os.lseek(fd, pos, os.SEEK_SET)
+                    os.write(fd, data)
+
+        def fetch(a, b):
+            r = self.s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={a}-{b}")
+            pos = a
+            for chunk in r["Body"].iter_chunks(1024 * 1024):
+                write_at(pos, chunk)
+                pos += len(chunk)
+                if progress_cb:
+                    progress_cb(len(chunk))
+            if pos != b + 1:
+                raise RuntimeError(f"Short range: bytes {a}-{pos - 1} of {a}-{b}")
+            return pos - a
+
+        # _run_bounded joins running fetches before fd is closed,
+        # or a reused fd number would receive an aborted download's bytes
+        try:
+            inflight = min(self.RANGED_INFLIGHT, self.connection_share(workers))
+            return sum(self._run_bounded(fetch, ranges, inflight))
+        finally:
+            os.close(fd)
+
     def get_object_size(self, bucket, key) -> int:
         r = self.s3.head_object(Bucket=bucket, Key=key)
         return int(r["ContentLength"])
@@ -95,15 +264,43 @@ class S3Client:
         self.s3.delete_object(Bucket=bucket, Key=key)
 
     def delete_objects(self, bucket, keys):
-        """Batch delete keys in chunks of 1000 (S3 limit)."""
+        """Batch delete keys in chunks of 1000 (S3 limit), chunks run in parallel."""
         if not keys:
             return
-        for i in range(0, len(keys), 1000):
-            chunk = keys[i:i + 1000]
-            self.s3.delete_objects(
+        chunks = [keys[i:i + 1000] for i in range(0, len(keys), 1000)]
+        if len(chunks) == 1:
+            self._delete_chunk(bucket, chunks[0])
+            return
+
+        self._run_bounded(self._delete_chunk, ((bucket, c) for c in chunks), self.DELETE_INFLIGHT)
+
+    def _delete_chunk(self, bucket, chunk, attempts=4):
+        """
+        One DeleteObjects call. A 200 can still list per-key Errors:
+        throttled keys are sent again (bounded backoff), the rest
+        raise S3DeleteError once no retries are left.
+        """
+        failed = []
+        delay = 0.5
+        for attempt in range(attempts):
+            r = self.s3.delete_objects(
                 Bucket=bucket,
                 Delete={"Objects": [{"Key": x} for x in chunk], "Quiet": True},
             )
+            retry = []
+            for e in r.get("Errors", ()):
+                if e.get("Code") in self.DELETE_RETRY_CODES and attempt < attempts - 1:
+                    retry.append(e["Key"])
+                else:
+                    failed.append(e)
+            if not retry:
+                break
+            chunk = retry
+            time.sleep(delay)
+            delay *= 2
+
+        if failed:
+            raise S3DeleteError(failed)
 
     def copy_object(self, src_bucket, src_key, dst_bucket, dst_key):
         self.s3.copy_object(
@@ -113,20 +310,71 @@ class S3Client:
         )
 
     # ---------------- folder semantics ----------------
-    def create_folder(self, bucket, prefix):
-        """Create S3 'folder' marker object ending with /"""
+    def create_folder(self, bucket, prefix, if_empty_only=True):
+        """
+        Create S3 'folder' marker object ending with /
+        if_empty_only: skip the PUT when anything already lives under prefix
+        (folders are virtual, so the marker adds nothing).
+        """
         if not prefix.endswith("/"):
             prefix += "/"
+        if if_empty_only:
+            r = self.s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
+            if r.get("KeyCount", 0) > 0:
+                return
         self.s3.put_object(Bucket=bucket, Key=prefix, Body=b"")
 
-    def delete_prefix(self, bucket, prefix):
-        """Delete everything under prefix + marker."""
+    def delete_prefixes(self, bucket, prefixes, progress_cb=None, cancel_cb=None):
+        """
+        delete_prefix for several folders, up to PREFIX_WALKERS at once,
+        so many small folders don't cost one serial round-trip chain each.
+        The walkers split DELETE_INFLIGHT between them.
+        """
+        if len(prefixes) == 1:
+            self.delete_prefix(bucket, prefixes[0], progress_cb, cancel_cb)
+            return
+        cancelled = cancel_cb or (lambda: False)
+        walkers = min(self.PREFIX_WALKERS, len(prefixes))
+        inflight = max(2, self.DELETE_INFLIGHT // walkers)
+        self._run_bounded(
+            lambda p: self.delete_prefix(bucket, p, progress_cb, cancel_cb, inflight),
+            ((p,) for p in prefixes), walkers, cancelled, pool=self._walk_pool,
+        )
+        if cancelled():
+            raise RuntimeError("Delete cancelled")
+
+    def delete_prefix(self, bucket, prefix, progress_cb=None, cancel_cb=None, inflight=None):
+        """
+        Delete everything under prefix + marker.
+        progress_cb(n): called (from pool threads) with the keys removed by each batch
+        cancel_cb(): return True to stop; raises RuntimeError("Delete cancelled")
+        inflight: DeleteObjects pages queued/running at once (default DELETE_INFLIGHT)
+        """
         if not prefix.endswith("/"):
             prefix += "/"
-        keys = self.list_all_keys(bucket, prefix)
+        pages = self._list_paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            PaginationConfig={"PageSize": 1000},
+        )
+        cancelled = cancel_cb or (lambda: False)
 
-        # delete all objects under prefix
-        self.delete_objects(bucket, keys)
+        def delete_page(keys):
+            self._delete_chunk(bucket, keys)
+            if progress_cb:
+                progress_cb(len(keys))
+
+        def key_pages():
+            for page in pages:
+                keys = [o["Key"] for o in page.get("Contents", ())]
+                if keys:
+                    yield (keys,)
+
+        # pages are deleted while later pages are listed; bounded, so at most
+        # a few pages of keys are held and no pool thread sits waiting for work
+        self._run_bounded(delete_page, key_pages(), inflight or self.DELETE_INFLIGHT, cancelled)
+        if cancelled():
+            raise RuntimeError("Delete cancelled")
 
         # delete marker too
         self.delete_object(bucket, prefix)
@@ -142,13 +390,16 @@ class S3Client:
         if not new_prefix.endswith("/"):
             new_prefix += "/"
 
-        keys = self.list_all_keys(bucket, old_prefix)
+        keys = []
+
+        def copies():
+            for k in self.iter_all_keys(bucket, old_prefix):
+                keys.append(k)
+                yield bucket, k, bucket, new_prefix + k[len(old_prefix):]
 
-        # copy all keys to new prefix
-        for k in keys:
-            suffix = k[len(old_prefix):]
-            dst = new_prefix + suffix
-            self.copy_object(bucket, k, bucket, dst)
+        # copy all keys to new prefix (in parallel, server-side); bounded, so the
+        # listing stays just ahead of the copies and the shared pool isn't flooded
+        self._run_bounded(self.copy_object, copies(), self.COPY_INFLIGHT)
 
         # delete old keys + marker
         self.delete_objects(bucket, keys)
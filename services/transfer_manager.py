@@ -1,34 +1,82 @@
+import os
+import time
 import uuid
 import heapq
 import itertools
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
 
 from PySide6.QtCore import QObject, Signal
 
 from workers.transfer_worker import TransferWorker
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class _QueueItem:
-    # heapq sorts by: priority, seq, ...
+    # heapq sorts by: priority, seq (only these take part in comparisons)
     priority: int
     seq: int
-    tid: str
-    mode: str          # "UPLOAD" | "DOWNLOAD" | "OPEN"
-    bucket: str
-    key: str
-    local_path: str
+    tid: str = field(compare=False)
+    mode: str = field(compare=False)          # "UPLOAD" | "DOWNLOAD" | "OPEN" | "COPY" | "MOVE"
+    bucket: str = field(compare=False)
+    key: str = field(compare=False)
+    local_path: str = field(compare=False)
+    size: int = field(compare=False, default=0)    # bytes, 0 = unknown
+    src_bucket: str = field(compare=False, default="")     # COPY / MOVE source
+    src_key: str = field(compare=False, default="")
+
+
+class _TransferCallbacks:
+    """
+    Per-worker signal handlers (one small object instead of a closure per signal).
+    """
+    def __init__(self, mgr, tid: str, mode: str, bucket: str, key: str):
+        self.mgr = mgr
+        self.tid = tid
+        self.mode = mode
+        self.bucket = bucket
+        self.key = key
+
+    # progress (the worker already throttles to ~10 Hz)
+    def on_tick(self, p: int, speed_bps: float, eta: float):
+        self.mgr.transfer_tick.emit(self.tid, p, speed_bps, eta)
+
+    # status (speed text etc)
+    def on_status(self, s: str):
+        self.mgr.transfer_updated.emit(self.tid, self.mode, self.bucket, self.key, -1, s)
+
+    def on_error(self, msg: str):
+        mgr = self.mgr
+        mgr.active.pop(self.tid, None)
+
+        if "cancel" in str(msg).lower():
+            mgr.transfer_updated.emit(self.tid, self.mode, self.bucket, self.key, -1, "Cancelled")
+        else:
+            mgr.transfer_updated.emit(self.tid, self.mode, self.bucket, self.key, -1, "Failed")
+
+        mgr.transfer_error.emit(self.tid, str(msg))
+        mgr._pump()
+
+    # done (worker emits local_path)
+    def on_done(self, worker_local_path: str):
+        mgr = self.mgr
+        mgr.active.pop(self.tid, None)
+        mgr.transfer_updated.emit(self.tid, self.mode, self.bucket, self.key, 100, "Done")
+        mgr.transfer_done.emit(self.tid, worker_local_path)
+        mgr._pump()
 
 
 class TransferManager(QObject):
     """
     Priority transfer queue like OneDrive:
       1) OPEN / VIEW  (highest)
-      2) DOWNLOAD
+      2) DOWNLOAD, COPY / MOVE (server-side)
       3) UPLOAD       (lowest)
 
-    - Runs up to max_parallel workers at once
+    - Runs up to N workers at once, N picked from the pending file-size mix
+      (see set_concurrency_policy); max_parallel when sizes are unknown
+    - Workers split the client's connection pool: each gets
+      max_pool_connections // N threads, and the shares never add up past it
     - New high-priority tasks jump ahead of uploads
     - UI stays responsive because work is in QThreads
     """
@@ -36,6 +84,12 @@ class TransferManager(QObject):
     # id, mode, bucket, key, progress(0-100 or -1), status
     transfer_updated = Signal(str, str, str, str, int, str)
 
+    # id, progress(0-100), bytes/s, eta seconds (raw; the UI formats them)
+    transfer_tick = Signal(str, int, float, float)
+
+    # [(id, mode, bucket, key), ...] for a bulk enqueue (one signal per batch)
+    transfers_queued = Signal(list)
+
     # (transfer_id, local_path)
     transfer_done = Signal(str, str)
 
@@ -45,62 +99,162 @@ class TransferManager(QObject):
     # priorities (lower = higher priority)
     PRI_OPEN = 0
     PRI_DOWNLOAD = 1
+    PRI_COPY = 1
     PRI_UPLOAD = 2
 
-    def __init__(self, s3_client, max_parallel: int = 2):
+    def __init__(self, s3_client, max_parallel: Optional[int] = None):
         super().__init__()
         self.s3 = s3_client
-        self.max_parallel = max_parallel
+        # fallback worker count when sizes are unknown: min(cpu, 8)
+        self.max_parallel = max_parallel or min(os.cpu_count() or 1, 8)
 
         self._pq = []                    # heap of _QueueItem
         self._seq = itertools.count()    # stable ordering
         self.active = {}                 # tid -> worker
         self._all_workers = set()        # keep refs alive
+        self._stopping = []              # interrupted by request_shutdown, not yet joined
+
+        # running size stats of queued items (known sizes only)
+        self._pending_bytes = 0
+        self._pending_sized = 0
+        self._policy: Callable[[Optional[float]], int] = self._default_policy
 
         # optional: allow "paused" later
         self._paused = False
 
     # ---------------- enqueue API ----------------
-    def enqueue_upload(self, bucket: str, key: str, local_path: str) -> str:
-        return self._enqueue(self.PRI_UPLOAD, "UPLOAD", bucket, key, local_path)
+    def enqueue_upload(self, bucket: str, key: str, local_path: str, size: int = 0) -> str:
+        if not size:
+            try:
+                size = os.path.getsize(local_path)
+            except OSError:
+                size = 0
+        return self._enqueue(self.PRI_UPLOAD, "UPLOAD", bucket, key, local_path, size)
 
-    def enqueue_download(self, bucket: str, key: str, local_path: str) -> str:
-        return self._enqueue(self.PRI_DOWNLOAD, "DOWNLOAD", bucket, key, local_path)
+    def enqueue_download(self, bucket: str, key: str, local_path: str, size: int = 0) -> str:
+        return self._enqueue(self.PRI_DOWNLOAD, "DOWNLOAD", bucket, key, local_path, size)
 
-    def enqueue_open(self, bucket: str, key: str, local_path: str) -> str:
+    def enqueue_open(self, bucket: str, key: str, local_path: str, size: int = 0) -> str:
         """
         Use this for "Open/View" so it jumps ahead of uploads.
         """
-        return self._enqueue(self.PRI_OPEN, "OPEN", bucket, key, local_path)
+        return self._enqueue(self.PRI_OPEN, "OPEN", bucket, key, local_path, size)
 
-    def _enqueue(self, priority: int, mode: str, bucket: str, key: str, local_path: str) -> str:
-        tid = str(uuid.uuid4())[:8]
-        item = _QueueItem(
+    def enqueue_copy(self, src_bucket: str, src_key: str, dst_bucket: str, dst_key: str,
+                     delete_after: bool = False) -> str:
+        """
+        Server-side copy in a worker; delete_after=True makes it a move (cut/paste).
+        """
+        mode = "MOVE" if delete_after else "COPY"
+        item = self._make_item(self.PRI_COPY, mode, dst_bucket, dst_key, "", 0)
+        item.src_bucket = src_bucket
+        item.src_key = src_key
+        heapq.heappush(self._pq, item)
+        self.transfer_updated.emit(item.tid, mode, dst_bucket, dst_key, 0, "Queued")
+        self._pump()
+        return item.tid
+
+    def bulk_enqueue_upload(self, items) -> list:
+        """
+        items: [(bucket, key, local_path), ...]
+        Heapifies once and emits a single transfers_queued signal
+        instead of one transfer_updated per file (drag & drop of many files).
+        """
+        new_items = []
+        for bucket, key, local_path in items:
+            try:
+                size = os.path.getsize(local_path)
+            except OSError:
+                size = 0
+            new_items.append(self._make_item(self.PRI_UPLOAD, "UPLOAD", bucket, key, local_path, size))
+
+        self._pq.extend(new_items)
+        heapq.heapify(self._pq)
+
+        self.transfers_queued.emit([(it.tid, it.mode, it.bucket, it.key) for it in new_items])
+        self._pump()
+        return [it.tid for it in new_items]
+
+    def _make_item(self, priority: int, mode: str, bucket: str, key: str, local_path: str,
+                   size: int) -> _QueueItem:
+        if size:
+            self._pending_bytes += size
+            self._pending_sized += 1
+        return _QueueItem(
             priority=priority,
             seq=next(self._seq),
-            tid=tid,
+            tid=str(uuid.uuid4())[:8],
             mode=mode,
             bucket=bucket,
             key=key,
             local_path=local_path,
+            size=size,
         )
+
+    def _enqueue(self, priority: int, mode: str, bucket: str, key: str, local_path: str,
+                 size: int = 0) -> str:
+        item = self._make_item(priority, mode, bucket, key, local_path, size)
         heapq.heappush(self._pq, item)
-        self.transfer_updated.emit(tid, mode, bucket, key, 0, "Queued")
+        self.transfer_updated.emit(item.tid, mode, bucket, key, 0, "Queued")
+        self._pump()
+        return item.tid
+
+    # ---------------- concurrency policy ----------------
+    def set_concurrency_policy(self, policy: Callable[[Optional[float]], int]):
+        """
+        policy(avg_pending_size_bytes or None) -> max workers.
+        """
+        self._policy = policy
         self._pump()
-        return tid
+
+    def _default_policy(self, avg_size: Optional[float]) -> int:
+        mb = 1024 * 1024
+        if avg_size is None:
+            return self.max_parallel
+        if avg_size < 8 * mb:
+            return 16       # many small files: whole-file parallelism wins
+        if avg_size < 128 * mb:
+            return 8
+        return 2            # big files: parallel parts inside each transfer
+
+    def _effective_parallel(self) -> int:
+        avg = self._pending_bytes / self._pending_sized if self._pending_sized else None
+        # every worker needs at least one pooled connection
+        return max(1, min(int(self._policy(avg)), self.s3.MAX_POOL_CONNECTIONS))
+
+    def _connections_in_use(self) -> int:
+        return sum(self.s3.connection_share(w.workers) for w in self.active.values())
 
     # ---------------- internal queue runner ----------------
     def _pump(self):
         if self._paused:
             return
 
-        while len(self.active) < self.max_parallel and self._pq:
+        while self._pq:
+            parallel = self._effective_parallel()
+            if len(self.active) >= parallel:
+                break
+            # workers started under a lower parallelism hold bigger shares:
+            # wait for them rather than run workers x threads past the pool
+            share = self.s3.connection_share(parallel)
+            if self._connections_in_use() + share > self.s3.MAX_POOL_CONNECTIONS:
+                break
+
             item = heapq.heappop(self._pq)
+            if item.size:
+                self._pending_bytes -= item.size
+                self._pending_sized -= 1
             tid, mode, bucket, key, local_path = item.tid, item.mode, item.bucket, item.key, item.local_path
 
-            # Worker only understands upload/download.
-            # OPEN is a DOWNLOAD with higher priority.
-            worker_mode = "download" if mode in ("DOWNLOAD", "OPEN") else "upload"
+            # Worker only understands upload/download/copy.
+            # OPEN is a DOWNLOAD with higher priority, fetched with ranged GETs.
+            # MOVE is a COPY that deletes the source afterwards.
+            if mode in ("DOWNLOAD", "OPEN"):
+                worker_mode = "download"
+            elif mode in ("COPY", "MOVE"):
+                worker_mode = "copy"
+            else:
+                worker_mode = "upload"
 
             w = TransferWorker(
                 s3_client=self.s3,
@@ -108,44 +262,23 @@ class TransferManager(QObject):
                 bucket=bucket,
                 key=key,
                 local_path=local_path,
+                ranged=(mode == "OPEN"),
+                src_bucket=item.src_bucket,
+                src_key=item.src_key,
+                delete_after=(mode == "MOVE"),
+                total=item.size,
+                workers=parallel,
             )
 
             self.active[tid] = w
             self._all_workers.add(w)
 
-            # progress
-            w.progress.connect(
-                lambda p, _tid=tid, _m=mode, _b=bucket, _k=key:
-                self.transfer_updated.emit(_tid, _m, _b, _k, p, "Running")
-            )
-
-            # status (speed text etc)
-            w.status.connect(
-                lambda s, _tid=tid, _m=mode, _b=bucket, _k=key:
-                self.transfer_updated.emit(_tid, _m, _b, _k, -1, s)
-            )
-
-            # error
-            def on_err(msg, _tid=tid, _m=mode, _b=bucket, _k=key):
-                self.active.pop(_tid, None)
-
-                if "cancel" in str(msg).lower():
-                    self.transfer_updated.emit(_tid, _m, _b, _k, -1, "Cancelled")
-                else:
-                    self.transfer_updated.emit(_tid, _m, _b, _k, -1, "Failed")
-
-                self.transfer_error.emit(_tid, str(msg))
-                self._pump()
-
-            # done (worker emits local_path)
-            def on_done(worker_local_path, _tid=tid, _m=mode, _b=bucket, _k=key):
-                self.active.pop(_tid, None)
-                self.transfer_updated.emit(_tid, _m, _b, _k, 100, "Done")
-                self.transfer_done.emit(_tid, worker_local_path)
-                self._pump()
-
-            w.error.connect(on_err)
-            w.done.connect(on_done)
+            cb = _TransferCallbacks(self, tid, mode, bucket, key)
+            w.callbacks = cb    # lives as long as the worker
+            w.tick.connect(cb.on_tick)
+            w.status.connect(cb.on_status)
+            w.error.connect(cb.on_error)
+            w.done.connect(cb.on_done)
 
             # cleanup only once when finished
             w.finished.connect(lambda _w=w: self._cleanup_worker(_w))
@@ -162,6 +295,8 @@ class TransferManager(QObject):
 
     def clear_queue(self):
         self._pq.clear()
+        self._pending_bytes = 0
+        self._pending_sized = 0
 
     def queued_count(self) -> int:
         return len(self._pq)
@@ -178,15 +313,35 @@ class TransferManager(QObject):
             pass
 
     # ---------------- shutdown ----------------
-    def shutdown(self):
+    def request_shutdown(self):
+        """
+        Non-blocking half of shutdown: stop the queue and ask every running
+        worker to stop. Threads wind down concurrently; see shutdown_join.
+        """
         self._paused = True
-        self._pq.clear()
+        self.clear_queue()
 
+        self._stopping = []
         for w in list(self._all_workers):
             try:
                 if w.isRunning():
                     w.requestInterruption()
                     w.quit()
-                    w.wait(1500)
+                    self._stopping.append(w)
             except Exception:
                 pass
+
+    def shutdown_join(self, timeout: float = 1.5):
+        """Wait (one shared deadline) for the workers request_shutdown stopped."""
+        running, self._stopping = self._stopping, []
+        deadline = time.monotonic() + timeout
+        for w in running:
+            try:
+                left_ms = max(0, int((deadline - time.monotonic()) * 1000))
+                w.wait(left_ms)
+            except Exception:
+                pass
+
+    def shutdown(self):
+        self.request_shutdown()
+        self.shutdown_join()
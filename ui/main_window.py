@@ -1,40 +1,88 @@
 import os
 import tempfile
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Optional
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTreeView, QTableView, QToolBar, QStatusBar,
     QLabel, QSplitter, QMessageBox, QFileDialog,
-    QApplication, QLineEdit, QMenu, QToolTip,
-    QStyle, QInputDialog, QDialog
+    QApplication, QLineEdit, QMenu,
+    QStyle, QInputDialog, QDialog, QHeaderView
+)
+from PySide6.QtCore import (
+    Qt, QSize, QTimer, QPoint, QModelIndex, QUrl,
+    QSortFilterProxyModel, QRegularExpression, QThreadPool
 )
-from PySide6.QtCore import Qt, QSize, QTimer, QPoint, QModelIndex, QUrl
 from PySide6.QtGui import (
     QAction, QStandardItemModel, QStandardItem,
     QDesktopServices, QKeySequence
 )
 
-from services.s3_client import S3Client
 from services.credential_store import CredentialStore
 from ui.credential_dialog import CredentialDialog
 from ui.confirm_dialog import ConfirmDialog
-from workers.s3_list_worker import S3ListWorker
+from workers.s3_list_worker import S3ListTask
+from workers.s3_connect_worker import S3ConnectWorker
+from workers.s3_delete_worker import S3DeleteTask
 from services.transfer_manager import TransferManager
 from ui.transfers_drawer import TransfersDrawer
+from ui.s3_table_model import S3TableModel
 from ui.styles import LIGHT_STYLE, DARK_STYLE
 
 
+class _PrefixLRU(OrderedDict):
+    """(bucket, prefix) -> (folders, files), keeping only the most recently used prefixes."""
+
+    def __init__(self, cap: int = 256):
+        super().__init__()
+        self.cap = cap
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.cap:
+            self.popitem(last=False)
+
+
+@dataclass(slots=True)
+class _Listing:
+    """One in-flight (bucket, prefix) listing and the callers waiting on it."""
+    waiters: list                   # [(on_page, on_error), ...]
+    cancel: threading.Event         # set: the S3ListTask stops between pages
+    budget: Optional[threading.Event] = None    # prefetch page budget; set = lifted
+    folders: list = field(default_factory=list)
+    files: list = field(default_factory=list)
+    delivered: int = 0              # pages delivered so far
+    stale: bool = False             # the prefix was invalidated after this started
+
+
 class MainWindow(QMainWindow):
     # table columns
-    COL_ICON = 0
-    COL_NAME = 1
-    COL_TYPE = 2
-    COL_SIZE = 3
-    COL_MODIFIED = 4
+    COL_ICON = S3TableModel.COL_ICON
+    COL_NAME = S3TableModel.COL_NAME
+    COL_TYPE = S3TableModel.COL_TYPE
+    COL_SIZE = S3TableModel.COL_SIZE
+    COL_MODIFIED = S3TableModel.COL_MODIFIED
+
+    # background listings: subfolders per table listing (first page), bucket roots per bucket load
+    PREFETCH_SUBFOLDERS = 32
+    PREFETCH_BUCKETS = 8
+
+    # QThreadPool priorities: what the user clicked runs before prefetches
+    PRI_LIST = 1
+    PRI_PREFETCH = 0
 
     # item roles
-    ROLE_KEY = Qt.UserRole + 1
-    ROLE_IS_FOLDER = Qt.UserRole + 2
+    ROLE_KEY = S3TableModel.ROLE_KEY
+    ROLE_IS_FOLDER = S3TableModel.ROLE_IS_FOLDER
 
     def __init__(self):
         super().__init__()
@@ -55,10 +103,26 @@ class MainWindow(QMainWindow):
         self.current_files = []
 
         # cache + worker safety
-        self.cache = {}             # (bucket,prefix) -> (folders, files)
-        self.tree_item_map = {}     # id -> item
+        self.cache = _PrefixLRU(256)    # (bucket,prefix) -> (folders, files)
+        self._cache_gen = 0             # bumped on every invalidation (drops older prefetches)
+        self.tree_item_map = {}     # (None, bucket) | (bucket, prefix) -> item
         self._workers = set()
-        self._nav_token = 0
+        self._task_pool = QThreadPool.globalInstance()     # listings: reused threads, not one QThread per click
+        self._task_pool.setMaxThreadCount(8)
+        # deletes can run for minutes: their own threads, so listings never queue behind them
+        self._delete_pool = QThreadPool(self)
+        self._delete_pool.setMaxThreadCount(2)
+        self._nav_token = 0         # table listings only
+        self._buckets_gen = 0       # bucket listings (tree rebuilds) only
+
+        # coalesce bursts of table navigations (see load_table_from_prefix)
+        self._nav_timer = QTimer(self)
+        self._nav_timer.setSingleShot(True)
+        self._nav_timer.setInterval(150)
+        self._nav_timer.timeout.connect(self._list_table)
+        self._pending_nav = None    # (bucket, prefix, token, force) waiting for the timer
+
+        self._inflight_list = {}    # (bucket, prefix) -> _Listing
 
         # clipboard-like (multi)
         self.clipboard_items = []   # [(bucket, key_or_prefix, is_folder)]
@@ -67,6 +131,10 @@ class MainWindow(QMainWindow):
         # tree behavior
         self.show_files_in_tree = False
 
+        # last bucket list + tree state, replayed on reconnect with the same creds
+        self._bucket_names = []
+        self._session_snapshot = None
+
         # open-after-download map
         self.open_after_done = {}   # transfer_id -> True
 
@@ -77,6 +145,15 @@ class MainWindow(QMainWindow):
         self._dark_enabled = True
         QApplication.instance().setStyleSheet(DARK_STYLE)
 
+        # toast: one reusable label + timer (no new tooltip/timer per message)
+        self._toast = QLabel(self)
+        self._toast.setObjectName("toast")
+        self._toast.setWindowFlags(Qt.ToolTip)
+        self._toast.hide()
+        self._toast_timer = QTimer(self)
+        self._toast_timer.setSingleShot(True)
+        self._toast_timer.timeout.connect(self._toast.hide)
+
         # build UI
         self.create_toolbar()
         self.create_center()
@@ -94,18 +171,63 @@ class MainWindow(QMainWindow):
         w.finished.connect(w.deleteLater)
         w.start()
 
+    def _run_task(self, t, priority: int = 0, pool=None):
+        """Run a QRunnable on the task pool (or pool); keep it (and its signals) alive until it finishes."""
+        self._workers.add(t)
+        t.signals.finished.connect(lambda: self._workers.discard(t))
+        (pool or self._task_pool).start(t, priority)
+
     def toast(self, message: str, ms: int = 1500):
-        pos = self.mapToGlobal(QPoint(20, self.height() - 60))
-        QToolTip.showText(pos, message, self)
-        QTimer.singleShot(ms, QToolTip.hideText)
+        self._toast.setText(message)
+        self._toast.adjustSize()
+        self._toast.move(self.mapToGlobal(QPoint(20, self.height() - 60)))
+        self._toast.show()
+        self._toast_timer.start(ms)
+
+    def _tree_item(self, view_index) -> QStandardItem:
+        """Tree view (proxy) index -> source QStandardItem."""
+        return self.tree_model.itemFromIndex(self.tree_proxy.mapToSource(view_index))
+
+    def _tree_view_index(self, item: QStandardItem) -> QModelIndex:
+        """Source QStandardItem -> tree view (proxy) index."""
+        return self.tree_proxy.mapFromSource(item.index())
 
     def _folder_of_key(self, key: str) -> str:
-        p = "/".join(key.split("/")[:-1]).strip()
+        p = key.rpartition("/")[0].strip()
         return (p + "/") if p else ""
 
     def invalidate_prefix(self, bucket: str, prefix: str):
         """Remove cache for (bucket,prefix) safely."""
+        if not bucket:
+            return
+        self._cache_gen += 1
         self.cache.pop((bucket, prefix), None)
+        self._mark_listings_stale(lambda k: k == (bucket, prefix))
+
+    def clear_cache(self):
+        self._cache_gen += 1
+        self.cache.clear()
+        self._mark_listings_stale(lambda k: True)
+
+    def invalidate_subtree(self, bucket: str, prefix: str):
+        """Remove cache for a folder and everything cached below it (it was moved/deleted)."""
+        if not bucket:
+            return
+        self._cache_gen += 1
+        for k in [k for k in self.cache if k[0] == bucket and k[1].startswith(prefix)]:
+            del self.cache[k]
+        self._mark_listings_stale(lambda k: k[0] == bucket and k[1].startswith(prefix))
+
+    def _mark_listings_stale(self, match):
+        """In-flight listings may predate the change: forced requests won't join them."""
+        for k, entry in self._inflight_list.items():
+            if match(k):
+                entry.stale = True
+
+    def _drop_listings(self):
+        for entry in self._inflight_list.values():
+            entry.cancel.set()
+        self._inflight_list.clear()
 
     def invalidate_and_reload_current(self, reload_tree: bool = True, reload_table: bool = True):
         """Invalidate current folder cache and reload UI."""
@@ -146,7 +268,13 @@ class MainWindow(QMainWindow):
         self.search_box.setPlaceholderText("Search files + folders…")
         self.search_box.setClearButtonEnabled(True)
         self.search_box.setFixedWidth(280)
-        self.search_box.textChanged.connect(self.apply_search_filter)
+        # debounce: filter once typing pauses, not on every keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(self.apply_search_filter)
+        self.search_box.textChanged.connect(lambda _text: self._search_timer.start())
+
         tb.addWidget(self.search_box)
 
         tb.addSeparator()
@@ -169,6 +297,11 @@ class MainWindow(QMainWindow):
         self.action_theme.triggered.connect(self.toggle_dark)
         self.action_tree_files.toggled.connect(self.on_toggle_tree_files)
 
+        # icons used per row in tree/table: look them up once
+        self._folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
+        self._file_icon = self.style().standardIcon(QStyle.SP_FileIcon)
+        self._bucket_icon = self.style().standardIcon(QStyle.SP_DriveNetIcon)
+
     def toggle_dark(self):
         self._dark_enabled = not self._dark_enabled
         QApplication.instance().setStyleSheet(DARK_STYLE if self._dark_enabled else LIGHT_STYLE)
@@ -266,11 +399,26 @@ class MainWindow(QMainWindow):
     def init_models(self):
         self.tree_model = QStandardItemModel()
         self.tree_model.setHorizontalHeaderLabels(["S3"])
-        self.tree.setModel(self.tree_model)
 
-        self.table_model = QStandardItemModel()
-        self.table_model.setHorizontalHeaderLabels(["", "Name", "Type", "Size (KB)", "Last Modified"])
-        self.table.setModel(self.table_model)
+        # tree search: Qt keeps ancestors of matches visible (recursive filter)
+        self.tree_proxy = QSortFilterProxyModel(self)
+        self.tree_proxy.setSourceModel(self.tree_model)
+        self.tree_proxy.setRecursiveFilteringEnabled(True)
+        self.tree_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.tree.setModel(self.tree_proxy)
+        self._tree_filter_term = ""
+
+        self.table_model = S3TableModel(self._folder_icon, self._file_icon, self)
+
+        # search + sort happen in the proxy (C++), not by rebuilding rows
+        self.table_proxy = QSortFilterProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table_proxy.setFilterKeyColumn(self.COL_NAME)
+        self.table_proxy.setFilterRole(self.ROLE_KEY)
+        self.table_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.table_proxy.setSortRole(S3TableModel.ROLE_SORT)
+        self.table_proxy.setDynamicSortFilter(True)
+        self.table.setModel(self.table_proxy)
 
     def configure_views(self):
         self.table.setAlternatingRowColors(True)
@@ -278,6 +426,20 @@ class MainWindow(QMainWindow):
         self.table.setSelectionMode(QTableView.ExtendedSelection)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.verticalHeader().setVisible(False)
+
+        # fixed row height + preset column widths: no per-row size queries
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        hh = self.table.horizontalHeader()
+        hh.setSectionResizeMode(QHeaderView.Interactive)
+        for col, width in (
+            (self.COL_ICON, 28),
+            (self.COL_NAME, 320),
+            (self.COL_TYPE, 80),
+            (self.COL_SIZE, 100),
+        ):
+            self.table.setColumnWidth(col, width)
+        self.tree.setUniformRowHeights(True)
         self.table.setSortingEnabled(True)
         self.table.doubleClicked.connect(self.on_table_double_clicked)
 
@@ -302,20 +464,25 @@ class MainWindow(QMainWindow):
 
     # -------------------- connect/disconnect --------------------
     def auto_connect_if_possible(self):
-        if CredentialStore.load():
-            self.connect_or_disconnect(auto=True)
+        # the worker checks for saved credentials; none -> stays disconnected
+        self.connect_or_disconnect(auto=True)
 
     def connect_or_disconnect(self, auto=False):
         if self.s3:
             # disconnect
-            self.s3 = None
+            self._session_snapshot = self._snapshot_session()
+            self._cancel_deletes()
             if self.transfer_mgr:
                 self.transfer_mgr.shutdown()
             self.transfer_mgr = None
+            self.s3.close()
+            self.s3 = None
 
-            self.cache.clear()
+            self.clear_cache()
+            self._drop_listings()
             self.tree_model.clear()
-            self.table_model.removeRows(0, self.table_model.rowCount())
+            self.tree_item_map.clear()
+            self.table_model.setRows([], [])
             self.current_bucket = None
             self.current_prefix = ""
             self.path_text.setText("")
@@ -324,34 +491,80 @@ class MainWindow(QMainWindow):
             return
 
         # connect
-        if not CredentialStore.load():
-            dlg = CredentialDialog()
-            if dlg.exec() != QDialog.Accepted:
-                if not auto:
-                    QMessageBox.warning(self, "Cancelled", "AWS credentials required.")
-                return
+        self._start_connect(auto)
+
+    def _start_connect(self, auto=False):
+        # keyring read + boto3 setup both run in the worker (either can stall the UI)
+        self.action_connect.setEnabled(False)
+        self.status_label.setText("Connecting…")
+        w = S3ConnectWorker()
+        w.client_ready.connect(self._on_client_ready)
+        w.needs_credentials.connect(lambda: self._on_needs_credentials(auto))
+        w.error.connect(self._on_connect_error)
+        self._run_worker(w)
 
-        try:
-            self.s3 = S3Client()
-            self.transfer_mgr = TransferManager(self.s3, max_parallel=2)
-            self.transfer_mgr.transfer_updated.connect(self.on_transfer_updated)
-            self.transfer_mgr.transfer_error.connect(self.on_transfer_error)
-            self.transfer_mgr.transfer_done.connect(self.on_transfer_done)
-
-            self.set_connected_state(True)
-            self.toast("Connected")
+    def _on_needs_credentials(self, auto):
+        self.action_connect.setEnabled(True)
+        self.set_connected_state(False)
+        if auto:
+            return
+        dlg = CredentialDialog()
+        if dlg.exec() != QDialog.Accepted:
+            QMessageBox.warning(self, "Cancelled", "AWS credentials required.")
+            return
+        self._start_connect()
+
+    def _on_client_ready(self, client):
+        self.action_connect.setEnabled(True)
+        self.s3 = client
+        self.transfer_mgr = TransferManager(self.s3)
+        self.transfer_mgr.transfer_updated.connect(self.on_transfer_updated)
+        self.transfer_mgr.transfers_queued.connect(self.on_transfers_queued)
+        self.transfer_mgr.transfer_tick.connect(self.transfers_drawer.tick)
+        self.transfer_mgr.transfer_error.connect(self.on_transfer_error)
+        self.transfer_mgr.transfer_done.connect(self.on_transfer_done)
+
+        self.set_connected_state(True)
+        self.toast("Connected")
+
+        # same creds as last session: rebuild the tree without listing buckets again
+        snap, self._session_snapshot = self._session_snapshot, None
+        if snap and snap["creds"] == self._creds_fingerprint():
+            self._restore_state_after_buckets = snap["state"]
+            self._buckets_gen += 1
+            self._on_buckets_ready(snap["buckets"], self._buckets_gen)
+        else:
             self.load_buckets_async()
-        except Exception as e:
-            self.set_connected_state(False)
-            QMessageBox.critical(self, "Connection Error", str(e))
+
+    def _creds_fingerprint(self):
+        # connected: S3ConnectWorker already read the keyring, so this hits the cache
+        creds = CredentialStore.load()
+        return hash(tuple(sorted(creds.items()))) if creds else None
+
+    def _snapshot_session(self):
+        return {
+            "creds": self._creds_fingerprint(),
+            "buckets": list(self._bucket_names),
+            "state": self.save_tree_state(),
+        }
+
+    def _on_connect_error(self, msg):
+        self.action_connect.setEnabled(True)
+        self.set_connected_state(False)
+        QMessageBox.critical(self, "Connection Error", msg)
 
     # -------------------- transfer callbacks --------------------
     def on_transfer_updated(self, tid, mode, bucket, key, progress, status):
         # save transfer meta so we can refresh correct folder after done
         self._transfer_meta[tid] = (mode, bucket, key)
 
-        row_progress = progress if progress >= 0 else 0
-        self.transfers_drawer.upsert(tid, mode, bucket, key, row_progress, status)
+        # -1 (status-only update, e.g. Failed/Cancelled) keeps the row's progress
+        self.transfers_drawer.upsert(tid, mode, bucket, key, progress, status)
+
+    def on_transfers_queued(self, items):
+        for tid, mode, bucket, key in items:
+            self._transfer_meta[tid] = (mode, bucket, key)
+        self.transfers_drawer.add_queued(items)
 
     def on_transfer_error(self, tid, msg):
         self.transfers_drawer.upsert(tid, "ERROR", "", "", 0, msg)
@@ -382,26 +595,28 @@ class MainWindow(QMainWindow):
                 self.refresh_tree_node_for_current()
 
     # -------------------- list buckets (async) --------------------
-    def load_buckets_async(self, restore_state=None):
+    def load_buckets_async(self, restore_state=None, reload_table: bool = False):
         self._restore_state_after_buckets = restore_state
-        self._nav_token += 1
-        token = self._nav_token
+        self._reload_table_after_buckets = reload_table
+        self._buckets_gen += 1
+        token = self._buckets_gen
 
-        w = S3ListWorker(mode="buckets")
-        w.buckets_ready.connect(lambda buckets: self._on_buckets_ready(buckets, token))
-        w.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
-        self._run_worker(w)
+        t = S3ListTask(self.s3, mode="buckets")
+        t.signals.buckets_ready.connect(lambda buckets: self._on_buckets_ready(buckets, token))
+        t.signals.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
+        self._run_task(t)
 
     def _on_buckets_ready(self, buckets, token):
-        if token != self._nav_token:
+        if token != self._buckets_gen:
             return
 
         self.tree_model.clear()
         self.tree_item_map.clear()
+        self._bucket_names = list(buckets)
 
-        icon = self.style().standardIcon(QStyle.SP_DriveNetIcon)
+        rows = []
         for b in buckets:
-            it = QStandardItem(icon, b)
+            it = QStandardItem(self._bucket_icon, b)
             it.setEditable(False)
             it.setData(("bucket", b))
 
@@ -409,25 +624,78 @@ class MainWindow(QMainWindow):
             ph.setEnabled(False)
             it.appendRow(ph)
 
-            self.tree_model.appendRow(it)
-            self.tree_item_map[f"b:{b}"] = it
+            rows.append(it)
+            self.tree_item_map[(None, b)] = it
+
+        if rows:
+            self.tree_model.invisibleRootItem().appendRows(rows)
+
+        # warm the first bucket roots in the background so expanding them is instant
+        # (capped: accounts with hundreds of buckets must not trigger a listing storm)
+        for b in buckets[:self.PREFETCH_BUCKETS]:
+            self._prefetch(b, "")
 
         if getattr(self, "_restore_state_after_buckets", None):
             self.restore_tree_state(self._restore_state_after_buckets)
             self._restore_state_after_buckets = None
 
+        # after the restore, so its tree listings don't supersede the table's
+        if getattr(self, "_reload_table_after_buckets", False):
+            self._reload_table_after_buckets = False
+            if self.current_bucket is not None:
+                self.load_table_from_prefix(self.current_bucket, self.current_prefix, force_refresh=True)
+
     # -------------------- tree expanded --------------------
     def on_tree_expanded(self, index):
         if not self.s3:
             return
-        item = self.tree_model.itemFromIndex(index)
+        item = self._tree_item(index)
         data = item.data()
         if not data:
             return
 
         t, bucket = data[0], data[1]
         prefix = data[2] if t == "folder" else ""
-        self.load_children(item, bucket, prefix, force=True)
+        # expanding uses the cache (often prefetched); clicking still forces a refresh
+        self.load_children(item, bucket, prefix, force=False)
+
+    def _prefetch(self, bucket, prefix):
+        """
+        Best-effort background listing into the cache, first page only:
+        a huge folder is dropped instead of listed in full (a click lists it).
+        Goes through _list_objects_async, so a user request for the same prefix
+        joins it (and vice versa) instead of listing twice.
+        """
+        key = (bucket, prefix)
+        if not self.s3 or key in self.cache or key in self._inflight_list:
+            return
+        gen = self._cache_gen
+        pages = ([], [])
+        self._list_objects_async(
+            bucket, prefix,
+            lambda folders, files, first, is_last:
+            self._on_prefetch_page(key, gen, pages, folders, files, first, is_last),
+            lambda msg: None,
+            priority=self.PRI_PREFETCH,
+            max_pages=1,
+        )
+
+    def _drop_prefetches(self):
+        """Navigation moved on: prefetches nobody joined stop (queued ones never call S3)."""
+        for k in [k for k, e in self._inflight_list.items()
+                  if e.budget is not None and not e.budget.is_set()]:
+            self._inflight_list.pop(k).cancel.set()
+
+    def _on_prefetch_page(self, key, gen, pages, folders, files, first, is_last):
+        if first:
+            pages[0].clear()
+            pages[1].clear()
+        pages[0].extend(folders)
+        pages[1].extend(files)
+        # started before an invalidation: the listing may predate the change;
+        # never overwrite a listing the UI fetched itself
+        if is_last and gen == self._cache_gen and key not in self.cache:
+            self.cache[key] = pages
 
     def load_children(self, parent_item, bucket, prefix, force: bool):
         """
@@ -445,30 +713,108 @@ class MainWindow(QMainWindow):
             self._apply_children(parent_item, bucket, prefix, folders, files)
             return
 
-        self._nav_token += 1
-        token = self._nav_token
-        w = S3ListWorker(mode="objects", bucket=bucket, prefix=prefix)
-        w.objects_ready.connect(
-            lambda folders, files: self._on_children_ready(parent_item, bucket, prefix, folders, files, token)
+        pages = ([], [])     # accumulated here, the worker only streams pages
+        self._list_objects_async(
+            bucket, prefix,
+            lambda folders, files, first, is_last: self._on_children_page(
+                parent_item, bucket, prefix, pages, folders, files, first, is_last),
+            lambda msg: None,
+            force=force,
         )
-        w.error.connect(lambda msg: None)
-        self._run_worker(w)
 
-    def _on_children_ready(self, parent_item, bucket, prefix, folders, files, token):
-        if token != self._nav_token:
+    def _on_children_page(self, parent_item, bucket, prefix, pages, folders, files, first, is_last):
+        if first:
+            # (re)started listing: drop pages from a superseded one
+            pages[0].clear()
+            pages[1].clear()
+        pages[0].extend(folders)
+        pages[1].extend(files)
+        if not is_last:
             return
-        self.cache[(bucket, prefix)] = (folders, files)
-        self._apply_children(parent_item, bucket, prefix, folders, files)
+        self.cache[(bucket, prefix)] = pages
+        try:
+            parent_item.index()
+        except RuntimeError:
+            return      # node removed (tree rebuilt / parent re-listed) while listing
+        self._apply_children(parent_item, bucket, prefix, *pages)
 
-    def _apply_children(self, parent_item, bucket, prefix, folders, files):
-        parent_item.removeRows(0, parent_item.rowCount())
+    def _list_objects_async(self, bucket, prefix, on_page, on_error, force: bool = False,
+                            priority: int = PRI_LIST, max_pages: int = 0):
+        """
+        One S3ListTask per (bucket, prefix) at a time.
+        on_page(folders, files, first, is_last); first=True means start over.
+
+        - A request for a prefix that is already listing joins it:
+          it gets the pages so far as one first page, then the remaining ones.
+        - force joins too, unless the prefix was invalidated after the listing
+          started (upload/delete/rename): then that listing is cancelled and
+          its waiters move to a fresh one.
+        - max_pages (prefetch): a listing with more pages is dropped, unless
+          an unbounded request joins it, which lifts the budget.
+        """
+        key = (bucket, prefix)
+        entry = self._inflight_list.get(key)
+        waiters = [(on_page, on_error)]
+        if entry is not None:
+            if not (force and entry.stale):
+                if not max_pages and entry.budget is not None:
+                    entry.budget.set()
+                if entry.delivered:
+                    on_page(list(entry.folders), list(entry.files), True, False)
+                entry.waiters.append((on_page, on_error))
+                return
+            entry.cancel.set()
+            waiters = entry.waiters + waiters
+            max_pages = 0
+        self._start_listing(key, waiters, priority, max_pages)
+
+    def _start_listing(self, key, waiters, priority, max_pages=0):
+        bucket, prefix = key
+        entry = _Listing(waiters, threading.Event(), threading.Event() if max_pages else None)
+        self._inflight_list[key] = entry
+        t = S3ListTask(self.s3, mode="objects", bucket=bucket, prefix=prefix,
+                       max_pages=max_pages, unbounded=entry.budget, cancel=entry.cancel)
+        t.signals.page_ready.connect(
+            lambda folders, files, is_last: self._on_list_page(key, entry, folders, files, is_last)
+        )
+        t.signals.truncated.connect(lambda: self._on_list_truncated(key, entry))
+        t.signals.error.connect(lambda msg: self._on_list_error(key, entry, msg))
+        self._run_task(t, priority)
+
+    def _on_list_page(self, key, entry, folders, files, is_last):
+        if self._inflight_list.get(key) is not entry:
+            return      # superseded by a forced listing, or dropped on disconnect
+        entry.folders.extend(folders)
+        entry.files.extend(files)
+        first = entry.delivered == 0
+        entry.delivered += 1
+        if is_last:
+            del self._inflight_list[key]
+        for on_page, _ in list(entry.waiters):
+            on_page(folders, files, first, is_last)
+
+    def _on_list_truncated(self, key, entry):
+        if self._inflight_list.get(key) is not entry:
+            return
+        del self._inflight_list[key]
+        if entry.budget.is_set():
+            # an unbounded request joined after the budget ran out: list in full
+            self._start_listing(key, entry.waiters, self.PRI_LIST)
 
-        folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
-        file_icon = self.style().standardIcon(QStyle.SP_FileIcon)
+    def _on_list_error(self, key, entry, msg):
+        if self._inflight_list.get(key) is not entry:
+            return
+        del self._inflight_list[key]
+        for _, on_error in entry.waiters:
+            on_error(msg)
 
+    def _apply_children(self, parent_item, bucket, prefix, folders, files):
+        # build every row first, then insert them in one batch
+        # (one rowsInserted + one view update instead of one per row)
+        rows = []
         for folder in folders:
-            name = folder.rstrip("/").split("/")[-1]
-            child = QStandardItem(folder_icon, name)
+            name = folder.rstrip("/").rpartition("/")[2]
+            child = QStandardItem(self._folder_icon, name)
             child.setEditable(False)
             child.setData(("folder", bucket, folder))
 
@@ -476,25 +822,31 @@ class MainWindow(QMainWindow):
             ph.setEnabled(False)
             child.appendRow(ph)
 
-            parent_item.appendRow(child)
-            self.tree_item_map[f"f:{bucket}:{folder}"] = child
+            rows.append(child)
+            self.tree_item_map[(bucket, folder)] = child
 
         if self.show_files_in_tree:
             for f in files:
                 key = f["Key"]
-                name = key.split("/")[-1]
-                fi = QStandardItem(file_icon, name)
+                name = key.rpartition("/")[2]
+                fi = QStandardItem(self._file_icon, name)
                 fi.setEditable(False)
                 fi.setData(("file", bucket, key))
-                parent_item.appendRow(fi)
+                rows.append(fi)
 
-        self.filter_tree(self.search_box.text().strip().lower())
+        self.tree.setUpdatesEnabled(False)
+        try:
+            parent_item.removeRows(0, parent_item.rowCount())
+            if rows:
+                parent_item.appendRows(rows)
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
     # -------------------- click tree --------------------
     def on_tree_clicked(self, index):
         if not self.s3:
             return
-        item = self.tree_model.itemFromIndex(index)
+        item = self._tree_item(index)
         data = item.data()
         if not data:
             return
@@ -524,116 +876,98 @@ class MainWindow(QMainWindow):
         if force_refresh:
             self.cache.pop(cache_key, None)
 
+        # every navigation (cached or not) makes older in-flight listings stale
+        self._nav_token += 1
+        token = self._nav_token
+        if not force_refresh:
+            self._drop_prefetches()
+        pending, self._pending_nav = self._pending_nav, None
+        if pending and pending[:2] == cache_key:
+            force_refresh = force_refresh or pending[3]     # a coalesced refresh stays forced
+
         if (not force_refresh) and cache_key in self.cache:
             folders, files = self.cache[cache_key]
             self.current_folders, self.current_files = folders, files
-            self.apply_search_filter()
+            self.table_model.setRows(folders, files)
             return
 
-        self._nav_token += 1
-        token = self._nav_token
-        w = S3ListWorker(mode="objects", bucket=bucket, prefix=prefix)
-        w.objects_ready.connect(lambda folders, files: self._on_objects_ready(bucket, prefix, folders, files, token))
-        w.error.connect(lambda msg: QMessageBox.critical(self, "Error", msg))
-        self._run_worker(w)
+        # leading edge lists at once; navigations during the next 150 ms
+        # coalesce into one trailing listing of the last target
+        self._pending_nav = (bucket, prefix, token, force_refresh)
+        if self._nav_timer.isActive():
+            return
+        self._nav_timer.start()
+        self._list_table()
+
+    def _list_table(self):
+        if self._pending_nav is None or not self.s3:
+            return
+        bucket, prefix, token, force = self._pending_nav
+        self._pending_nav = None
+        self._list_objects_async(
+            bucket, prefix,
+            lambda folders, files, first, is_last:
+            self._on_objects_page(bucket, prefix, folders, files, first, is_last, token),
+            lambda msg: QMessageBox.critical(self, "Error", msg),
+            force=force,
+        )
 
-    def _on_objects_ready(self, bucket, prefix, folders, files, token):
+    def _on_objects_page(self, bucket, prefix, folders, files, first, is_last, token):
+        """Show each listing page as it arrives; cache only the complete listing."""
         if token != self._nav_token:
             return
-        self.cache[(bucket, prefix)] = (folders, files)
-        self.current_folders, self.current_files = folders, files
-        self.apply_search_filter()
+        if first:
+            self.current_folders, self.current_files = list(folders), list(files)
+            self.table_model.setRows(folders, files)
+
+            # warm subfolders while the remaining pages are still listing
+            for sub in folders[:self.PREFETCH_SUBFOLDERS]:
+                self._prefetch(bucket, sub)
+        else:
+            self.current_folders.extend(folders)
+            self.current_files.extend(files)
+            self.table.setUpdatesEnabled(False)
+            try:
+                self.table_model.appendRows(folders, files)
+            finally:
+                self.table.setUpdatesEnabled(True)
+
+        if is_last:
+            self.cache[(bucket, prefix)] = (self.current_folders, self.current_files)
 
     # -------------------- search (table + tree) --------------------
     def apply_search_filter(self):
-        term = self.search_box.text().strip().lower()
+        # read once; both proxies match case-insensitively, so no lower()
+        term = self.search_box.text().strip()
         self.filter_tree(term)
+        self.table_proxy.setFilterRegularExpression(self._search_regex(term))
 
-        if not term:
-            folders, files = self.current_folders, self.current_files
-        else:
-            folders = [f for f in self.current_folders if term in f.lower()]
-            files = [f for f in self.current_files if term in f["Key"].lower()]
-
-        self.populate_table(folders, files)
+    def _search_regex(self, term: str) -> QRegularExpression:
+        """Space-separated tokens -> one compiled pattern matching any of them."""
+        pattern = "|".join(QRegularExpression.escape(t) for t in term.split())
+        return QRegularExpression(pattern, QRegularExpression.CaseInsensitiveOption)
 
     def filter_tree(self, term: str):
-        term = (term or "").strip().lower()
-
-        def recurse(parent_item: QStandardItem, parent_index: QModelIndex) -> bool:
-            any_visible = False
-            for row in range(parent_item.rowCount()):
-                child = parent_item.child(row)
-                child_index = child.index()
-                child_visible = recurse(child, child_index)
-                match = term in child.text().lower() if term else True
-                show = True if not term else (match or child_visible)
-                self.tree.setRowHidden(row, parent_index, not show)
-                if show:
-                    any_visible = True
-            return any_visible
-
-        recurse(self.tree_model.invisibleRootItem(), QModelIndex())
-
-    def populate_table(self, folders, files):
-        self.table_model.removeRows(0, self.table_model.rowCount())
-
-        folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
-        file_icon = self.style().standardIcon(QStyle.SP_FileIcon)
-
-        for folder in folders:
-            name = folder.rstrip("/").split("/")[-1]
-            icon_item = QStandardItem()
-            icon_item.setIcon(folder_icon)
-
-            name_item = QStandardItem(name)
-            name_item.setData(folder, self.ROLE_KEY)
-            name_item.setData(True, self.ROLE_IS_FOLDER)
-
-            self.table_model.appendRow([
-                icon_item, name_item,
-                QStandardItem("Folder"),
-                QStandardItem(""),
-                QStandardItem("")
-            ])
-
-        for f in files:
-            key = f["Key"]
-            name = key.split("/")[-1]
-            ext = os.path.splitext(name)[1].lstrip(".").upper() or "FILE"
-            size_kb = round(int(f["Size"]) / 1024, 2)
-            mod = f["LastModified"].strftime("%Y-%m-%d %H:%M")
-
-            icon_item = QStandardItem()
-            icon_item.setIcon(file_icon)
-
-            name_item = QStandardItem(name)
-            name_item.setData(key, self.ROLE_KEY)
-            name_item.setData(False, self.ROLE_IS_FOLDER)
-
-            self.table_model.appendRow([
-                icon_item, name_item,
-                QStandardItem(ext),
-                QStandardItem(str(size_kb)),
-                QStandardItem(mod)
-            ])
+        # unchanged term (e.g. empty -> empty): nothing to re-filter
+        if term == self._tree_filter_term:
+            return
+        self._tree_filter_term = term
+        self.tree_proxy.setFilterRegularExpression(self._search_regex(term))
 
     # -------------------- double click table --------------------
     def on_table_double_clicked(self, index):
-        row = index.row()
-        name_item = self.table_model.item(row, self.COL_NAME)
-        key_or_prefix = name_item.data(self.ROLE_KEY)
-        is_folder = bool(name_item.data(self.ROLE_IS_FOLDER))
+        row = self.table_proxy.mapToSource(index).row()
+        key_or_prefix, is_folder = self.table_model.entry(row)
 
         if is_folder:
             self.current_prefix = key_or_prefix
             self.path_text.setText(f"{self.current_bucket}/{self.current_prefix}")
             self.load_table_from_prefix(self.current_bucket, self.current_prefix, force_refresh=False)
         else:
-            self.open_key(key_or_prefix)
+            self.open_key(key_or_prefix, self.table_model.file_size(row))
 
     # -------------------- open/download --------------------
-    def open_key(self, key):
+    def open_key(self, key, size: int = 0):
         if not self.transfer_mgr or not self.current_bucket:
             return
 
@@ -641,20 +975,20 @@ class MainWindow(QMainWindow):
         os.makedirs(tmp_dir, exist_ok=True)
         local_path = os.path.join(tmp_dir, os.path.basename(key))
 
-        tid = self.transfer_mgr.enqueue_download(self.current_bucket, key, local_path)
+        tid = self.transfer_mgr.enqueue_open(self.current_bucket, key, local_path, size=size)
         self.open_after_done[tid] = True
 
         self.transfers_drawer.setVisible(True)
         self.action_transfers.setChecked(True)
         self.toast("Downloading to open…")
 
-    def download_key(self, key):
+    def download_key(self, key, size: int = 0):
         if not self.transfer_mgr or not self.current_bucket:
             return
         save_path, _ = QFileDialog.getSaveFileName(self, "Save file as", os.path.basename(key))
         if not save_path:
             return
-        self.transfer_mgr.enqueue_download(self.current_bucket, key, save_path)
+        self.transfer_mgr.enqueue_download(self.current_bucket, key, save_path, size=size)
         self.transfers_drawer.setVisible(True)
         self.action_transfers.setChecked(True)
         self.toast("Download queued")
@@ -688,6 +1022,7 @@ class MainWindow(QMainWindow):
         selection = self._get_selected_items()
         is_single = (len(selection) == 1)
         key_or_prefix, is_folder = selection[0] if is_single else (None, False)
+        size = self.table_model.file_size(self.table_proxy.mapToSource(idx).row()) if is_single else 0
 
         act_open = menu.addAction("Open")
         act_download = None
@@ -718,10 +1053,10 @@ class MainWindow(QMainWindow):
                 self.path_text.setText(f"{self.current_bucket}/{self.current_prefix}")
                 self.load_table_from_prefix(self.current_bucket, self.current_prefix, force_refresh=False)
             elif is_single and (not is_folder):
-                self.open_key(key_or_prefix)
+                self.open_key(key_or_prefix, size)
 
         elif chosen == act_download and act_download and is_single:
-            self.download_key(key_or_prefix)
+            self.download_key(key_or_prefix, size)
 
         elif chosen == act_cut:
             self.cut_selected()
@@ -753,10 +1088,7 @@ class MainWindow(QMainWindow):
         rows = self.table.selectionModel().selectedRows()
         out = []
         for idx in rows:
-            r = idx.row()
-            name_item = self.table_model.item(r, self.COL_NAME)
-            key_or_prefix = name_item.data(self.ROLE_KEY)
-            is_folder = bool(name_item.data(self.ROLE_IS_FOLDER))
+            key_or_prefix, is_folder = self.table_model.entry(self.table_proxy.mapToSource(idx).row())
             if key_or_prefix:
                 out.append((key_or_prefix, is_folder))
         return out
@@ -779,35 +1111,33 @@ class MainWindow(QMainWindow):
         self.toast(f"Cut {len(items)} item(s)")
 
     def paste_into_current(self):
-        if not self.s3 or not self.current_bucket:
+        if not self.transfer_mgr or not self.current_bucket:
             return
         if not self.clipboard_items:
             self.toast("Clipboard empty")
             return
 
         # multi file paste (folder paste later)
-        for src_bucket, src_key, is_folder in self.clipboard_items:
-            if is_folder:
-                QMessageBox.information(self, "Paste", "Folder paste is not enabled yet (needs recursive copy).")
-                return
+        if any(is_folder for _, _, is_folder in self.clipboard_items):
+            QMessageBox.information(self, "Paste", "Folder paste is not enabled yet (needs recursive copy).")
+            return
 
-            name = src_key.split("/")[-1]
+        # copies run in transfer workers; each done refreshes its folder
+        for src_bucket, src_key, _ in self.clipboard_items:
+            name = src_key.rpartition("/")[2]
             dst_key = f"{self.current_prefix}{name}"
-
-            try:
-                self.s3.copy_object(src_bucket, src_key, self.current_bucket, dst_key)
-                if self.clipboard_cut:
-                    self.s3.delete_object(src_bucket, src_key)
-            except Exception as e:
-                QMessageBox.critical(self, "Paste Error", str(e))
-                return
+            self.transfer_mgr.enqueue_copy(
+                src_bucket, src_key, self.current_bucket, dst_key,
+                delete_after=self.clipboard_cut,
+            )
 
         if self.clipboard_cut:
             self.clipboard_items = []
             self.clipboard_cut = False
 
-        self.toast("Pasted")
-        self.invalidate_and_reload_current(reload_tree=True, reload_table=True)
+        self.transfers_drawer.setVisible(True)
+        self.action_transfers.setChecked(True)
+        self.toast("Paste queued")
 
     # -------------------- rename --------------------
     def rename_selected(self):
@@ -818,7 +1148,9 @@ class MainWindow(QMainWindow):
         self.rename_item(key, is_folder)
 
     def rename_item(self, key_or_prefix, is_folder: bool):
-        old_name = key_or_prefix.rstrip("/").split("/")[-1]
+        base = key_or_prefix.rstrip("/") if is_folder else key_or_prefix
+        parent, _, old_name = base.rpartition("/")
+        parent = (parent + "/") if parent else ""
         new_name, ok = QInputDialog.getText(self, "Rename", "New name:", text=old_name)
         if not ok or not new_name.strip():
             return
@@ -826,13 +1158,11 @@ class MainWindow(QMainWindow):
 
         try:
             if is_folder:
-                parent = "/".join(key_or_prefix.rstrip("/").split("/")[:-1])
-                parent = (parent + "/") if parent else ""
                 new_prefix = parent + new_name + "/"
                 self.s3.rename_folder(self.current_bucket, key_or_prefix, new_prefix)
+                self.invalidate_subtree(self.current_bucket, key_or_prefix)
+                self.invalidate_subtree(self.current_bucket, new_prefix)
             else:
-                parent = "/".join(key_or_prefix.split("/")[:-1])
-                parent = (parent + "/") if parent else ""
                 new_key = parent + new_name
                 self.s3.rename_file(self.current_bucket, key_or_prefix, new_key)
         except Exception as e:
@@ -840,6 +1170,7 @@ class MainWindow(QMainWindow):
             return
 
         self.toast("Renamed")
+        self.invalidate_prefix(self.current_bucket, parent)
         self.invalidate_and_reload_current(reload_tree=True, reload_table=True)
 
     # -------------------- delete --------------------
@@ -854,36 +1185,49 @@ class MainWindow(QMainWindow):
             return
 
         # optimistic remove from table immediately
-        selected_rows = sorted({idx.row() for idx in self.table.selectionModel().selectedRows()}, reverse=True)
-        for r in selected_rows:
-            self.table_model.removeRow(r)
-
-        # do delete on S3
+        selected_rows = sorted(
+            {self.table_proxy.mapToSource(idx).row() for idx in self.table.selectionModel().selectedRows()},
+            reverse=True,
+        )
+        self.table.setUpdatesEnabled(False)
+        try:
+            for r in selected_rows:
+                self.table_model.removeRow(r)
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+        # do delete on S3 (pool thread, batched DeleteObjects)
+        bucket, prefix = self.current_bucket, self.current_prefix
+        t = S3DeleteTask(self.s3, bucket, items)
+        t.signals.progress.connect(lambda n: self.toast(f"Deleting… {n} object(s)"))
+        t.signals.deleted.connect(lambda n: self._on_delete_done(bucket, prefix, items))
+        t.signals.error.connect(lambda msg: self._on_delete_error(bucket, prefix, items, msg))
+        self._run_task(t, pool=self._delete_pool)
+
+    def _evict_deleted(self, bucket, prefix, items):
+        # only the listing that held the items + the deleted folders' own subtrees
+        self.invalidate_prefix(bucket, prefix)
         for key_or_prefix, is_folder in items:
-            try:
-                if is_folder:
-                    # If you updated S3Client with delete_prefix(), use it:
-                    if hasattr(self.s3, "delete_prefix"):
-                        self.s3.delete_prefix(self.current_bucket, key_or_prefix)
-                    else:
-                        keys = self.s3.list_all_keys(self.current_bucket, key_or_prefix)
-                        if keys and hasattr(self.s3, "delete_objects"):
-                            self.s3.delete_objects(self.current_bucket, keys)
-                        else:
-                            # fallback
-                            for k in keys:
-                                self.s3.delete_object(self.current_bucket, k)
-                        self.s3.delete_object(self.current_bucket, key_or_prefix)
-                else:
-                    self.s3.delete_object(self.current_bucket, key_or_prefix)
-            except Exception as e:
-                QMessageBox.critical(self, "Delete Error", str(e))
-                # hard refresh to recover UI
-                self.refresh_current()
-                return
+            if is_folder:
+                self.invalidate_subtree(bucket, key_or_prefix)
 
+    def _cancel_deletes(self):
+        for t in list(self._workers):
+            if isinstance(t, S3DeleteTask):
+                t.cancel()
+
+    def _on_delete_done(self, bucket, prefix, items):
         self.toast("Deleted")
-        self.invalidate_and_reload_current(reload_tree=True, reload_table=True)
+        self._evict_deleted(bucket, prefix, items)
+        if bucket == self.current_bucket and prefix == self.current_prefix:
+            self.invalidate_and_reload_current(reload_tree=True, reload_table=True)
+
+    def _on_delete_error(self, bucket, prefix, items, msg):
+        QMessageBox.critical(self, "Delete Error", msg)
+        # partial delete: re-list what it touched (not the whole tree)
+        self._evict_deleted(bucket, prefix, items)
+        if bucket == self.current_bucket and prefix == self.current_prefix:
+            self.invalidate_and_reload_current(reload_tree=True, reload_table=True)
 
     # -------------------- new folder --------------------
     def create_new_folder(self):
@@ -919,10 +1263,10 @@ class MainWindow(QMainWindow):
         if not files:
             return
 
-        for p in files:
-            filename = os.path.basename(p)
-            key = f"{self.current_prefix}{filename}"
-            self.transfer_mgr.enqueue_upload(self.current_bucket, key, p)
+        self.transfer_mgr.bulk_enqueue_upload([
+            (self.current_bucket, f"{self.current_prefix}{os.path.basename(p)}", p)
+            for p in files
+        ])
 
         self.transfers_drawer.setVisible(True)
         self.action_transfers.setChecked(True)
@@ -936,12 +1280,10 @@ class MainWindow(QMainWindow):
         state = self.save_tree_state()
 
         # IMPORTANT: clear cache so both sides update
-        self.cache.clear()
-
-        self.load_buckets_async(restore_state=state)
+        self.clear_cache()
 
-        if self.current_bucket is not None:
-            self.load_table_from_prefix(self.current_bucket, self.current_prefix, force_refresh=True)
+        # one table fetch, fired once the tree is rebuilt
+        self.load_buckets_async(restore_state=state, reload_table=True)
 
         self.toast("Refreshed")
 
@@ -952,7 +1294,7 @@ class MainWindow(QMainWindow):
         idx = self.tree.currentIndex()
         if not idx.isValid():
             return
-        item = self.tree_model.itemFromIndex(idx)
+        item = self._tree_item(idx)
         if not item:
             return
         data = item.data()
@@ -961,27 +1303,31 @@ class MainWindow(QMainWindow):
         if data[0] in ("bucket", "folder"):
             bucket = data[1]
             prefix = data[2] if data[0] == "folder" else ""
-            self.cache.pop((bucket, prefix), None)
             self.load_children(item, bucket, prefix, force=True)
 
     def save_tree_state(self):
         expanded = set()
+        is_expanded = self.tree.isExpanded
+        view_index = self._tree_view_index
 
-        def walk(parent_item):
+        # iterative walk (no Python recursion); leaves (files, placeholders) are skipped
+        stack = deque([self.tree_model.invisibleRootItem()])
+        while stack:
+            parent_item = stack.pop()
             for r in range(parent_item.rowCount()):
                 child = parent_item.child(r)
-                if self.tree.isExpanded(child.index()):
+                if not child.hasChildren():
+                    continue
+                if is_expanded(view_index(child)):
                     cid = self.item_id(child)
                     if cid:
                         expanded.add(cid)
-                walk(child)
-
-        walk(self.tree_model.invisibleRootItem())
+                stack.append(child)
 
         selected_id = None
         idx = self.tree.currentIndex()
         if idx.isValid():
-            selected_id = self.item_id(self.tree_model.itemFromIndex(idx))
+            selected_id = self.item_id(self._tree_item(idx))
 
         return {"expanded": expanded, "selected": selected_id}
 
@@ -990,28 +1336,33 @@ class MainWindow(QMainWindow):
         selected_id = state.get("selected")
 
         def depth(x):
-            if x.startswith("b:"):
-                return 0
-            parts = x.split(":", 2)
-            return parts[2].count("/") if len(parts) == 3 else 0
+            bucket, prefix = x
+            return 0 if bucket is None else prefix.count("/")
 
         expanded.sort(key=depth)
-        for eid in expanded:
-            item = self.tree_item_map.get(eid)
-            if item:
-                self.tree.expand(item.index())
+
+        # one layout/paint pass for the whole restore, not one per expand.
+        # (no expandRecursively: every expand triggers an S3 listing)
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for eid in expanded:
+                item = self.tree_item_map.get(eid)
+                if item:
+                    self.tree.expand(self._tree_view_index(item))
+        finally:
+            self.tree.setUpdatesEnabled(True)
 
         if selected_id and selected_id in self.tree_item_map:
-            self.tree.setCurrentIndex(self.tree_item_map[selected_id].index())
+            self.tree.setCurrentIndex(self._tree_view_index(self.tree_item_map[selected_id]))
 
     def item_id(self, item: QStandardItem):
         data = item.data()
         if not data:
             return None
         if data[0] == "bucket":
-            return f"b:{data[1]}"
+            return (None, data[1])
         if data[0] == "folder":
-            return f"f:{data[1]}:{data[2]}"
+            return (data[1], data[2])
         return None
 
     # -------------------- path enter --------------------
@@ -1036,8 +1387,13 @@ class MainWindow(QMainWindow):
     # -------------------- safe shutdown --------------------
     def closeEvent(self, event):
         try:
+            self._cancel_deletes()
             if self.transfer_mgr:
-                self.transfer_mgr.shutdown()
+                # don't block the close: stop now, join once the event loop is done
+                self.transfer_mgr.request_shutdown()
+                QApplication.instance().aboutToQuit.connect(self.transfer_mgr.shutdown_join)
+            if self.s3:
+                self.s3.close()
         except Exception:
             pass
         super().closeEvent(event)
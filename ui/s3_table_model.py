@@ -0,0 +1,152 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class S3TableModel(QAbstractTableModel):
+    """
+    Lazy table for one S3 listing level.
+
+    Rows are folders first, then files. Nothing is built per row:
+    Qt asks data() only for visible cells, and cells are computed on demand
+    from the raw listing (folder prefixes + list_objects_v2 dicts).
+    """
+
+    # columns
+    COL_ICON = 0
+    COL_NAME = 1
+    COL_TYPE = 2
+    COL_SIZE = 3
+    COL_MODIFIED = 4
+
+    HEADERS = ["", "Name", "Type", "Size (KB)", "Last Modified"]
+
+    # item roles
+    ROLE_KEY = Qt.UserRole + 1
+    ROLE_IS_FOLDER = Qt.UserRole + 2
+    ROLE_SORT = Qt.UserRole + 3     # raw sortable value (used by the proxy)
+
+    def __init__(self, folder_icon, file_icon, parent=None):
+        super().__init__(parent)
+        self.folder_icon = folder_icon
+        self.file_icon = file_icon
+
+        self._folders = []      # ["a/b/", ...]
+        self._files = []        # [{"Key", "Size", "LastModified", ...}, ...]
+
+    # ---------------- data API ----------------
+    def setRows(self, folders, files):
+        self.beginResetModel()
+        self._folders = list(folders)
+        self._files = list(files)
+        self.endResetModel()
+
+    def appendRows(self, folders, files):
+        """Add one more listing page (folders join the folder block, files go last)."""
+        if folders:
+            nf = len(self._folders)
+            self.beginInsertRows(QModelIndex(), nf, nf + len(folders) - 1)
+            self._folders.extend(folders)
+            self.endInsertRows()
+        if files:
+            n = self.rowCount()
+            self.beginInsertRows(QModelIndex(), n, n + len(files) - 1)
+            self._files.extend(files)
+            self.endInsertRows()
+
+    def entry(self, row: int):
+        """(key_or_prefix, is_folder) for a row."""
+        nf = len(self._folders)
+        if row < nf:
+            return self._folders[row], True
+        return self._files[row - nf]["Key"], False
+
+    def file_size(self, row: int) -> int:
+        """Listed size in bytes (0 for folders)."""
+        nf = len(self._folders)
+        return 0 if row < nf else int(self._files[row - nf]["Size"])
+
+    # ---------------- Qt model ----------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._folders) + len(self._files)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        nf = len(self._folders)
+        is_folder = row < nf
+
+        if role == Qt.DisplayRole:
+            if is_folder:
+                if col == self.COL_NAME:
+                    return self._folders[row].rstrip("/").rpartition("/")[2]
+                if col == self.COL_TYPE:
+                    return "Folder"
+                return ""
+
+            f = self._files[row - nf]
+            if col == self.COL_NAME:
+                return f["Key"].rpartition("/")[2]
+            if col == self.COL_TYPE:
+                head, dot, ext = f["Key"].rpartition("/")[2].rpartition(".")
+                # like os.path.splitext: leading dots (".env") are not an extension
+                return (ext.upper() if dot and head.strip(".") else "") or "FILE"
+            if col == self.COL_SIZE:
+                return str(round(int(f["Size"]) / 1024, 2))
+            if col == self.COL_MODIFIED:
+                return f["LastModified"].strftime("%Y-%m-%d %H:%M")
+            return ""
+
+        if role == Qt.DecorationRole and col == self.COL_ICON:
+            return self.folder_icon if is_folder else self.file_icon
+
+        if role == self.ROLE_KEY:
+            return self._folders[row] if is_folder else self._files[row - nf]["Key"]
+
+        if role == self.ROLE_IS_FOLDER:
+            return is_folder
+
+        if role == self.ROLE_SORT:
+            return self._sort_value(row, col)
+
+        return None
+
+    def _sort_value(self, row, col):
+        nf = len(self._folders)
+        if row < nf:
+            if col == self.COL_SIZE:
+                return -1
+            if col == self.COL_MODIFIED:
+                return 0
+            return self.data(self.index(row, col)).lower()
+
+        f = self._files[row - nf]
+        if col == self.COL_SIZE:
+            return int(f["Size"])
+        if col == self.COL_MODIFIED:
+            return int(f["LastModified"].timestamp())
+        return self.data(self.index(row, col)).lower()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or count <= 0 or row < 0 or row + count > self.rowCount():
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for r in range(row + count - 1, row - 1, -1):
+            nf = len(self._folders)
+            if r < nf:
+                del self._folders[r]
+            else:
+                del self._files[r - nf]
+        self.endRemoveRows()
+        return True
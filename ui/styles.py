@@ -94,7 +94,7 @@ QMenu::separator {
 }
 
 /* Tooltip toast */
-QToolTip {
+QToolTip, QLabel#toast {
     background: #111827;
     color: #ffffff;
     border: 1px solid #334155;
@@ -102,6 +102,9 @@ QToolTip {
     border-radius: 8px;
 }
 
+/* Transfers drawer */
+QLabel#drawerTitle { font-weight: 700; }
+
 /* Custom confirm dialog */
 QDialog { background: #ffffff; }
 QLabel#dlgTitle { font-size: 11pt; font-weight: 700; color: #0b1220; }
@@ -219,7 +222,7 @@ QMenu::separator {
 }
 
 /* Tooltip toast */
-QToolTip {
+QToolTip, QLabel#toast {
     background: #0f172a;
     color: #e5e7eb;
     border: 1px solid #334155;
@@ -227,6 +230,9 @@ QToolTip {
     border-radius: 8px;
 }
 
+/* Transfers drawer */
+QLabel#drawerTitle { font-weight: 700; }
+
 /* Custom confirm dialog */
 QDialog { background: #0f172a; }
 QLabel#dlgTitle { font-size: 11pt; font-weight: 700; color: #e5e7eb; }
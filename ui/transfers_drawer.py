@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QTableWidget, QTableWidgetItem,
+    QTableView,
     QAbstractItemView, QToolButton, QStyle
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Signal
+
+from ui.transfers_model import TransfersModel
 
 
 class TransfersDrawer(QWidget):
@@ -22,7 +24,7 @@ class TransfersDrawer(QWidget):
         header.setContentsMargins(0, 0, 0, 0)
 
         self.title = QLabel("Transfers")
-        self.title.setStyleSheet("font-weight:700;")
+        self.title.setObjectName("drawerTitle")     # styled by the app sheet
         header.addWidget(self.title)
 
         header.addStretch(1)
@@ -36,8 +38,9 @@ class TransfersDrawer(QWidget):
         root.addLayout(header)
 
         # ---- table ----
-        self.table = QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["Type", "Bucket", "Key", "Progress", "Status"])
+        self.model = TransfersModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.verticalHeader().setVisible(False)
 
@@ -46,21 +49,47 @@ class TransfersDrawer(QWidget):
 
         root.addWidget(self.table, 1)
 
-        self.rows = {}  # transfer_id -> row index
+        # while hidden, only the latest update per transfer is kept (applied on show)
+        self._pending = {}  # transfer_id -> (progress or None, status or (speed_bps, eta))
+
+    def add_queued(self, items):
+        """Insert many 'Queued' rows at once: [(transfer_id, mode, bucket, key), ...]"""
+        self.model.appendTransfers(
+            [(transfer_id, mode, bucket, key, 0, "Queued") for transfer_id, mode, bucket, key in items]
+        )
+
+    def tick(self, transfer_id: str, progress: int, speed_bps: float, eta: float):
+        """Running transfer progress; the status text is built here, not in the worker."""
+        if not self.model.has(transfer_id):
+            return
+        if not self.isVisible():
+            self._pending[transfer_id] = (progress, (speed_bps, eta))    # formatted on show
+            return
+        self.model.setProgress(transfer_id, progress, self._tick_text(transfer_id, progress, speed_bps, eta))
 
     def upsert(self, transfer_id: str, mode: str, bucket: str, key: str, progress: int, status: str):
-        if transfer_id not in self.rows:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-            self.rows[transfer_id] = row
-
-            self.table.setItem(row, 0, QTableWidgetItem(mode))
-            self.table.setItem(row, 1, QTableWidgetItem(bucket))
-            self.table.setItem(row, 2, QTableWidgetItem(key))
-            self.table.setItem(row, 3, QTableWidgetItem(str(max(0, progress))))
-            self.table.setItem(row, 4, QTableWidgetItem(status))
-        else:
-            row = self.rows[transfer_id]
-            if progress >= 0:
-                self.table.item(row, 3).setText(str(progress))
-            self.table.item(row, 4).setText(status)
+        """progress -1: status-only update, the row keeps its progress."""
+        if not self.model.has(transfer_id):
+            self.model.appendTransfers([(transfer_id, mode, bucket, key, max(0, progress), status)])
+            return
+
+        progress = progress if progress >= 0 else None
+        if not self.isVisible():
+            prev = self._pending.get(transfer_id)
+            if progress is None and prev is not None:
+                progress = prev[0]
+            self._pending[transfer_id] = (progress, status)
+            return
+        self.model.setProgress(transfer_id, progress, status)
+
+    def _tick_text(self, transfer_id, progress, speed_bps, eta):
+        mode = self.model.mode_of(transfer_id)
+        return f"{mode} {progress}%  ({speed_bps / (1024 * 1024):.2f} MB/s, {int(eta)}s left)"
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        pending, self._pending = self._pending, {}
+        for transfer_id, (progress, status) in pending.items():
+            if isinstance(status, tuple):
+                status = self._tick_text(transfer_id, progress, *status)
+            self.model.setProgress(transfer_id, progress, status)
@@ -0,0 +1,74 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class TransfersModel(QAbstractTableModel):
+    """
+    Rows of the transfers drawer: [mode, bucket, key, progress, status].
+
+    New transfers are inserted with one beginInsertRows per batch;
+    progress updates only touch the progress/status cells (dataChanged).
+    """
+
+    COL_MODE = 0
+    COL_BUCKET = 1
+    COL_KEY = 2
+    COL_PROGRESS = 3
+    COL_STATUS = 4
+
+    HEADERS = ["Type", "Bucket", "Key", "Progress", "Status"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []         # [[mode, bucket, key, progress, status], ...]
+        self._id_to_row = {}    # transfer_id -> row index
+
+    # ---------------- data API ----------------
+    def has(self, transfer_id: str) -> bool:
+        return transfer_id in self._id_to_row
+
+    def mode_of(self, transfer_id: str) -> str:
+        return self._rows[self._id_to_row[transfer_id]][self.COL_MODE]
+
+    def appendTransfers(self, rows):
+        """Add [(transfer_id, mode, bucket, key, progress, status), ...] in one insert."""
+        rows = [r for r in rows if r[0] not in self._id_to_row]
+        if not rows:
+            return
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(rows) - 1)
+        for i, (transfer_id, mode, bucket, key, progress, status) in enumerate(rows):
+            self._id_to_row[transfer_id] = n + i
+            self._rows.append([mode, bucket, key, str(progress), status])
+        self.endInsertRows()
+
+    def setProgress(self, transfer_id: str, progress, status: str):
+        """Update progress (None = keep) + status of an existing row."""
+        row = self._id_to_row[transfer_id]
+        r = self._rows[row]
+        first = self.COL_STATUS
+        if progress is not None:
+            r[self.COL_PROGRESS] = str(progress)
+            first = self.COL_PROGRESS
+        r[self.COL_STATUS] = status
+        self.dataChanged.emit(self.index(row, first), self.index(row, self.COL_STATUS), [Qt.DisplayRole])
+
+    # ---------------- Qt model ----------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self._rows[index.row()][index.column()]
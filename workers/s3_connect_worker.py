@@ -0,0 +1,20 @@
+from PySide6.QtCore import QThread, Signal
+from services.credential_store import CredentialStore
+from services.s3_client import S3Client
+
+
+class S3ConnectWorker(QThread):
+    """Reads the credentials (keyring) and builds the S3Client off the UI thread."""
+    client_ready = Signal(object)   # S3Client
+    needs_credentials = Signal()    # nothing saved yet: the UI asks the user
+    error = Signal(str)
+
+    def run(self):
+        try:
+            creds = CredentialStore.load()
+            if not creds:
+                self.needs_credentials.emit()
+                return
+            self.client_ready.emit(S3Client(creds))
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,66 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+class S3DeleteSignals(QObject):
+    progress = Signal(int)          # keys removed so far
+    deleted = Signal(int)           # number of keys removed
+    error = Signal(str)
+    finished = Signal()
+
+
+class S3DeleteTask(QRunnable):
+    """
+    Deletes selected files + folders off the UI thread (on the shared QThreadPool).
+    - Selected files go out in batched DeleteObjects calls (1000 keys each)
+    - Folders stream through S3Client.delete_prefixes (a few at once): pages are
+      deleted while later pages are listed, so memory stays bounded for huge prefixes
+    """
+
+    def __init__(self, s3_client, bucket: str, items):
+        super().__init__()
+        self.s3 = s3_client
+        self.bucket = bucket
+        self.items = list(items)    # [(key_or_prefix, is_folder)]
+        self.signals = S3DeleteSignals()
+
+        self._cancelled = False
+        self._done = 0
+        self._lock = threading.Lock()   # progress comes from several pool threads
+
+    def cancel(self):
+        """Stop after the batches already in flight (disconnect / close)."""
+        self._cancelled = True
+
+    def _progress(self, n):
+        with self._lock:
+            self._done += n
+            done = self._done
+        self.signals.progress.emit(done)
+
+    def run(self):
+        signals = self.signals
+        try:
+            files = [k for k, is_folder in self.items if not is_folder]
+            prefixes = [k for k, is_folder in self.items if is_folder]
+
+            if files:
+                self.s3.delete_objects(self.bucket, files)
+                self._progress(len(files))
+
+            if prefixes and not self._cancelled:
+                self.s3.delete_prefixes(
+                    self.bucket, prefixes,
+                    progress_cb=self._progress,
+                    cancel_cb=lambda: self._cancelled,
+                )
+
+            if not self._cancelled:
+                signals.deleted.emit(self._done)
+
+        except Exception as e:
+            if not self._cancelled:
+                signals.error.emit(str(e))
+        finally:
+            signals.finished.emit()
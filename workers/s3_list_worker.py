@@ -1,27 +1,56 @@
-from PySide6.QtCore import QThread, Signal
-from services.s3_client import S3Client
+from PySide6.QtCore import QObject, QRunnable, Signal
 
 
-class S3ListWorker(QThread):
+class S3ListSignals(QObject):
     buckets_ready = Signal(list)
-    objects_ready = Signal(list, list)  # folders, files
+    page_ready = Signal(list, list, bool)  # folders, files, is_last (per page)
+    truncated = Signal()                   # stopped at max_pages, more pages exist
     error = Signal(str)
+    finished = Signal()
 
-    def __init__(self, mode: str, bucket: str = "", prefix: str = ""):
+
+class S3ListTask(QRunnable):
+    """
+    One listing, run on a shared QThreadPool (no QThread spawned per click).
+    QRunnable can't emit, so results come back through self.signals.
+    """
+
+    def __init__(self, s3_client, mode: str, bucket: str = "", prefix: str = "",
+                 max_pages: int = 0, unbounded=None, cancel=None):
         super().__init__()
+        self.s3 = s3_client         # shared S3Client (boto3 clients are thread-safe)
         self.mode = mode
         self.bucket = bucket
         self.prefix = prefix
+        self.max_pages = max_pages  # 0 = list every page
+        self.unbounded = unbounded  # threading.Event; set (by the UI) lifts max_pages
+        self.cancel = cancel        # threading.Event; set = superseded, stop between pages
+        self.signals = S3ListSignals()
 
     def run(self):
+        signals = self.signals
         try:
-            client = S3Client()
+            client = self.s3
 
             if self.mode == "buckets":
-                self.buckets_ready.emit(client.list_buckets())
+                signals.buckets_ready.emit(client.list_buckets())
             elif self.mode == "objects":
-                folders, files = client.list_objects(self.bucket, self.prefix)
-                self.objects_ready.emit(folders, files)
+                if self.cancel and self.cancel.is_set():
+                    return      # dropped while queued: no S3 call
+                n = 0
+                for folders, files, truncated in client.iter_object_pages(self.bucket, self.prefix):
+                    if self.cancel and self.cancel.is_set():
+                        return
+                    n += 1
+                    if (truncated and self.max_pages and n >= self.max_pages
+                            and not (self.unbounded and self.unbounded.is_set())):
+                        signals.truncated.emit()
+                        return
+                    signals.page_ready.emit(folders, files, not truncated)
+                if not n:
+                    signals.page_ready.emit([], [], True)
 
         except Exception as e:
-            self.error.emit(str(e))
+            signals.error.emit(str(e))
+        finally:
+            signals.finished.emit()
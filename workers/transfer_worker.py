@@ -1,26 +1,45 @@
 import os
+import threading
 import time
+from pathlib import Path
 from PySide6.QtCore import QThread, Signal
 
 
 class TransferWorker(QThread):
-    progress = Signal(int)          # 0-100
-    status = Signal(str)            # text
+    MIN_EMIT_STEP = 256 * 1024      # bytes between progress ticks (small files)
+    EMIT_INTERVAL = 0.1             # min seconds between progress ticks (~10 Hz)
+
+    tick = Signal(int, float, float)    # pct 0-100, bytes/s, eta seconds
+    status = Signal(str)                # phase text
     error = Signal(str)
     done = Signal(str)              # emits local_path when finished
 
-    def __init__(self, s3_client, mode: str, bucket: str, key: str, local_path: str):
+    def __init__(self, s3_client, mode: str, bucket: str, key: str, local_path: str, ranged: bool = False,
+                 src_bucket: str = "", src_key: str = "", delete_after: bool = False, total: int = 0,
+                 workers: int = 1):
         super().__init__()
         self.s3 = s3_client
-        self.mode = mode            # "upload" | "download"
+        self.mode = mode            # "upload" | "download" | "copy"
         self.bucket = bucket
         self.key = key
         self.local_path = local_path
+        self.ranged = ranged        # download via parallel byte-range GETs
+
+        # copy: server-side src -> (bucket, key); delete_after makes it a move
+        self.src_bucket = src_bucket
+        self.src_key = src_key
+        self.delete_after = delete_after
 
+        self.total = total          # size from the listing (0 = unknown)
+        self.workers = workers      # transfers sharing the connection pool with this one
         self._total = 0
         self._seen = 0
         self._t0 = 0.0
-        self._last_emit = 0.0
+        self._last_emit_bytes = 0
+        self._last_emit_ts = 0.0
+        self._emit_step = self.MIN_EMIT_STEP
+        # boto3 calls _cb from several transfer threads at once
+        self._cb_lock = threading.Lock()
 
         # ✅ safer cancel mechanism (don't throw inside boto callback)
         self._cancel_requested = False
@@ -32,33 +51,40 @@ class TransferWorker(QThread):
             self._cancel_requested = True
             return
 
-        self._seen += int(bytes_amount)
-        if not self._total:
-            return
-
-        now = time.time()
-
-        # throttle UI updates
-        if now - self._last_emit < 0.12:
-            return
-        self._last_emit = now
-
-        pct = int((self._seen / self._total) * 100)
-        pct = max(0, min(100, pct))
-
+        with self._cb_lock:
+            self._seen += int(bytes_amount)
+            seen = self._seen
+
+            # throttle by bytes (~200 ticks per file), no clock read per callback,
+            # then by time, so a fast link doesn't wake the UI thread per step;
+            # the last bytes always go through
+            if not self._total or seen - self._last_emit_bytes < self._emit_step:
+                return
+            now = time.monotonic()
+            if seen < self._total and now - self._last_emit_ts < self.EMIT_INTERVAL:
+                return
+            self._last_emit_bytes = seen
+            self._last_emit_ts = now
+
+        pct = max(0, min(100, seen * 100 // self._total))
         elapsed = max(0.001, now - self._t0)
-        speed_bps = self._seen / elapsed
-        speed_mb = speed_bps / (1024 * 1024)
+        speed_bps = seen / elapsed
+        eta = max(0, self._total - seen) / speed_bps
+
+        # raw numbers: the drawer formats them
+        self.tick.emit(pct, speed_bps, eta)
 
-        self.progress.emit(pct)
-        self.status.emit(f"{self.mode.upper()} {pct}%  ({speed_mb:.2f} MB/s)")
+    def _set_total(self, total: int):
+        self._total = total
+        self._emit_step = max(total // 200, self.MIN_EMIT_STEP)
 
     # ---------------- main thread function ----------------
     def run(self):
         try:
             self._seen = 0
-            self._last_emit = 0.0
-            self._t0 = time.time()
+            self._last_emit_bytes = 0
+            self._last_emit_ts = 0.0
+            self._t0 = time.monotonic()
             self._cancel_requested = False
 
             if self.mode == "download":
@@ -67,54 +93,73 @@ class TransferWorker(QThread):
                 # ✅ ensure destination folder exists
                 os.makedirs(os.path.dirname(self.local_path) or ".", exist_ok=True)
 
-                self._total = int(self.s3.get_object_size(self.bucket, self.key))
+                # plain downloads: the listed size is enough (boto3 does its own HEAD);
+                # ranged GETs are planned from the size, so those ask S3 for the current one
+                if self.total and not self.ranged:
+                    self._set_total(self.total)
+                else:
+                    self._set_total(int(self.s3.get_object_size(self.bucket, self.key)))
 
-                self.s3.download_file(
+                download = self.s3.download_file_ranged if self.ranged else self.s3.download_file
+                written = download(
                     self.bucket,
                     self.key,
                     self.local_path,
-                    progress_cb=self._cb
+                    progress_cb=self._cb,
+                    size=self._total,
+                    workers=self.workers,
                 )
 
                 # ✅ if cancel requested during transfer
                 if self._cancel_requested:
                     # best effort: remove partial file
                     try:
-                        if os.path.exists(self.local_path):
-                            os.remove(self.local_path)
-                    except Exception:
+                        Path(self.local_path).unlink(missing_ok=True)
+                    except OSError:
                         pass
                     raise RuntimeError("Transfer cancelled")
 
-                # ✅ verify download actually exists
-                if not os.path.exists(self.local_path):
+                # ✅ verify download exists (and, when S3 gave us the size, is complete): one stat
+                try:
+                    sz = os.stat(self.local_path).st_size
+                except FileNotFoundError:
                     raise RuntimeError("Download finished but file not found on disk")
+                # ranged: the file was preallocated to the full size, so count what was written
+                if self.ranged:
+                    sz = written
+                # a listed size may be stale (object replaced since), so only a HEAD size is checked
+                if (self.ranged or not self.total) and sz != self._total:
+                    raise RuntimeError(f"Short download: {sz} of {self._total} bytes")
 
             elif self.mode == "upload":
                 self.status.emit("Starting upload…")
 
-                if not os.path.exists(self.local_path):
+                try:
+                    self._set_total(os.stat(self.local_path).st_size)
+                except FileNotFoundError:
                     raise RuntimeError("Local file not found for upload")
 
-                self._total = int(os.path.getsize(self.local_path))
-
                 self.s3.upload_file(
                     self.local_path,
                     self.bucket,
                     self.key,
-                    progress_cb=self._cb
+                    progress_cb=self._cb,
+                    size=self._total,
+                    workers=self.workers,
                 )
 
                 if self._cancel_requested:
                     raise RuntimeError("Transfer cancelled")
 
+            elif self.mode == "copy":
+                self.status.emit("Copying…")
+                self.s3.copy_object(self.src_bucket, self.src_key, self.bucket, self.key)
+                if self.delete_after:
+                    self.s3.delete_object(self.src_bucket, self.src_key)
+
             else:
                 raise RuntimeError("Invalid transfer mode")
 
-            # final emit
-            self.progress.emit(100)
-            self.status.emit("Done")
-
             # ✅ return local_path so UI can open after download
             self.done.emit(self.local_path)
 